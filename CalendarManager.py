@@ -1,21 +1,35 @@
 # CalendarManager.py
 
 import tkinter as tk
-from tkinter import Toplevel, Button
-from tkcalendar import Calendar
+from tkinter import Toplevel, Button, messagebox
+
+# tkcalendar is imported on first use; loading it registers ttk styles and
+# locale data that most sessions never need.
+_Calendar = None
 
 def open_calendar(master, text_widget, current_theme):
     """
-    Open a calendar dialog if it doesn't exist or has been closed.
+    Open the calendar dialog, reusing the hidden window from a previous open if it still exists.
     
     :param master: The main Tkinter window.
     :param text_widget: The Text widget where the date will be inserted.
     :param current_theme: Dictionary containing current theme colors.
-    :return: The calendar window as Toplevel, or None if already open.
+    :return: The calendar window as Toplevel.
     """
+    calendar_window = getattr(master, "_calendar_win", None)
+    if calendar_window is not None and calendar_window.winfo_exists():
+        center_calendar_window(master, calendar_window)
+        # The window was themed when it was built; the theme may have changed since
+        theme_calendar_window(calendar_window, current_theme)
+        bind_select_actions(calendar_window, text_widget)
+        calendar_window.deiconify()
+        calendar_window.lift()
+        return calendar_window
+
     calendar_window = create_calendar_window(master, current_theme)
     setup_calendar_widget(calendar_window, current_theme)
     add_select_button(calendar_window, text_widget, current_theme)
+    master._calendar_win = calendar_window
     return calendar_window
 
 def create_calendar_window(master, current_theme):
@@ -28,8 +42,35 @@ def create_calendar_window(master, current_theme):
     """
     window = Toplevel(master)
     window.title("Calendar")
-    window.geometry("300x300")
+    center_calendar_window(master, window)
+
+    configure_widget(window, bg=current_theme["background"])
+    window.protocol("WM_DELETE_WINDOW", lambda: close_calendar(window))
+    return window
 
+def theme_calendar_window(calendar_window, current_theme):
+    """
+    Apply the theme colors to a calendar window, its Calendar widget and its 'Select' button.
+    
+    :param calendar_window: The Toplevel window for the calendar.
+    :param current_theme: Dictionary containing current theme colors.
+    """
+    background = current_theme["background"]
+    text = current_theme["text"]
+    configure_widget(calendar_window, bg=background)
+    # tkcalendar takes only the long option names
+    calendar_window.cal.configure(background=background, foreground=text)
+    configure_widget(calendar_window.confirm_btn, 
+                    bg=current_theme.get("button_background", background), 
+                    fg=current_theme.get("button_foreground", text))
+
+def center_calendar_window(master, window):
+    """
+    Position the calendar window at the center of the main application.
+    
+    :param master: The main Tkinter window.
+    :param window: The Toplevel window for the calendar.
+    """
     # Calculate the center position relative to the main window
     main_window_x = master.winfo_x()
     main_window_y = master.winfo_y()
@@ -44,13 +85,9 @@ def create_calendar_window(master, current_theme):
     center_x = main_window_x + (main_window_width // 2) - (calendar_width // 2)
     center_y = main_window_y + (main_window_height // 2) - (calendar_height // 2)
 
-    # Set the geometry of the calendar window to center it
+    # Size and center the calendar window in a single geometry pass
     window.geometry(f"{calendar_width}x{calendar_height}+{center_x}+{center_y}")
 
-    configure_widget(window, bg=current_theme["background"])
-    window.protocol("WM_DELETE_WINDOW", lambda: close_calendar(window))
-    return window
-
 def setup_calendar_widget(calendar_window, current_theme):
     """
     Initialize and configure the Calendar widget.
@@ -58,7 +95,10 @@ def setup_calendar_widget(calendar_window, current_theme):
     :param calendar_window: The Toplevel window for the calendar.
     :param current_theme: Dictionary containing current theme colors.
     """
-    cal = Calendar(calendar_window, 
+    global _Calendar
+    if _Calendar is None:
+        from tkcalendar import Calendar as _Calendar
+    cal = _Calendar(calendar_window, 
                 selectmode='day', 
                 year=2024, month=11, day=18, 
                 background=current_theme["background"], 
@@ -74,15 +114,26 @@ def add_select_button(calendar_window, text_widget, current_theme):
     :param text_widget: The Text widget where the date will be inserted.
     :param current_theme: Dictionary containing current theme colors.
     """
-    cal = calendar_window.cal
-    cal.bind("<<CalendarSelected>>", lambda event: select_date(cal, text_widget, calendar_window))
-    confirm_btn = Button(calendar_window, 
-                        text="Select", 
-                        command=lambda: select_date(cal, text_widget, calendar_window))
+    background = current_theme["background"]
+    text = current_theme["text"]
+    confirm_btn = Button(calendar_window, text="Select")
     configure_widget(confirm_btn, 
-                    bg=current_theme.get("button_background", current_theme["background"]), 
-                    fg=current_theme.get("button_foreground", current_theme["text"]))
+                    bg=current_theme.get("button_background", background), 
+                    fg=current_theme.get("button_foreground", text))
     confirm_btn.pack(pady=5)
+    calendar_window.confirm_btn = confirm_btn
+    bind_select_actions(calendar_window, text_widget)
+
+def bind_select_actions(calendar_window, text_widget):
+    """
+    Point the calendar selection event and the 'Select' button at a text widget.
+    
+    :param calendar_window: The Toplevel window for the calendar.
+    :param text_widget: The Text widget where the date will be inserted.
+    """
+    cal = calendar_window.cal
+    cal.bind("<<CalendarSelected>>", lambda event: select_date(cal, text_widget, calendar_window))
+    calendar_window.confirm_btn.configure(command=lambda: select_date(cal, text_widget, calendar_window))
 
 def select_date(cal, text_widget, calendar_window):
     """
@@ -97,17 +148,16 @@ def select_date(cal, text_widget, calendar_window):
         text_widget.insert(tk.INSERT, str(selected_date))
         close_calendar(calendar_window)
     except AttributeError:
-        import tkinter.messagebox as messagebox
         messagebox.showerror("Error", "No date selected.")
 
 def close_calendar(calendar_window):
     """
-    Handle the closing of the calendar window.
+    Hide the calendar window so the next open can reuse it.
     
     :param calendar_window: The Toplevel window for the calendar.
     """
     if calendar_window:
-        calendar_window.destroy()
+        calendar_window.withdraw()
 
 def configure_widget(widget, bg=None, fg=None):
     """
@@ -117,7 +167,10 @@ def configure_widget(widget, bg=None, fg=None):
     :param bg: Background color.
     :param fg: Foreground color.
     """
+    options = {}
     if bg:
-        widget.configure(bg=bg)
+        options["bg"] = bg
     if fg:
-        widget.configure(fg=fg)
\ No newline at end of file
+        options["fg"] = fg
+    if options:
+        widget.configure(**options)
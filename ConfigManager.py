@@ -1,14 +1,43 @@
-import json
+import os
+import atexit
+import weakref
+
+from JsonIO import read_json, dumps as _dumps
+
+# Managers holding changes not yet written; held weakly so a discarded manager is not kept alive
+_unsaved_managers = weakref.WeakSet()
+
+@atexit.register
+def _flush_unsaved_managers():
+    """
+    Write the changes still waiting for a delayed write, in case the app exits without flush().
+
+    Only managers with unsaved changes are written, so a stale manager never overwrites
+    a file another one has saved since.
+    """
+    for manager in list(_unsaved_managers):
+        manager.flush()
 
 class ConfigManager:
-    def __init__(self, config_file="config.json"):
+    # Delay before pending changes are written when a Tk master is available
+    SAVE_DELAY_MS = 500
+    # Instance attributes that config keys must never shadow
+    _RESERVED_ATTRS = frozenset({"config_file", "master", "config"})
+
+    def __init__(self, config_file="config.json", master=None):
         """
         Initialize ConfigManager with a default or specified config file.
 
         :param config_file: Path to the configuration file (default: "config.json")
+        :param master: Optional Tk widget used to batch writes; without it every set() saves immediately
         """
         self.config_file = config_file
+        self.master = master
+        self._dirty = False
+        self._save_after_id = None
         self.config = self.load_config()
+        for key, value in self.config.items():
+            self._promote(key, value)
 
     def load_config(self):
         """
@@ -17,9 +46,8 @@ class ConfigManager:
         :return: A dictionary containing configuration parameters
         """
         try:
-            with open(self.config_file, 'r') as file:
-                return json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError):
+            return read_json(self.config_file)
+        except (FileNotFoundError, ValueError):
             print(f"Warning: Config file '{self.config_file}' not found or corrupted. Using default settings.")
             return {
                 "autosave_delay": 60000,  # 1 minute in milliseconds
@@ -41,21 +69,67 @@ class ConfigManager:
 
     def set(self, key, value):
         """
-        Set a configuration value and save it to the JSON file.
+        Set a configuration value and schedule it to be saved to the JSON file.
+
+        Consecutive calls within SAVE_DELAY_MS are written to disk once, and setting a key
+        to the value it already holds schedules no write at all.
 
         :param key: The key for the configuration setting
         :param value: The value to set for the key
         """
+        if key in self.config and self.config[key] == value:
+            return
         self.config[key] = value
-        self.save_config()
+        self._promote(key, value)
+        self._dirty = True
+        _unsaved_managers.add(self)
+        if self.master is None:
+            self.flush()
+        elif self._save_after_id is None:
+            self._save_after_id = self.master.after(self.SAVE_DELAY_MS, self.flush)
+
+    def _promote(self, key, value):
+        """
+        Mirror a configuration value as an instance attribute, e.g. `config_manager.autosave_delay`.
+
+        Keys that are not identifiers or would shadow a method or internal attribute are skipped.
+
+        :param key: The key for the configuration setting
+        :param value: The value of the setting
+        """
+        if (isinstance(key, str) and key.isidentifier() and not key.startswith("_")
+                and key not in self._RESERVED_ATTRS and not hasattr(type(self), key)):
+            setattr(self, key, value)
+
+    def flush(self):
+        """
+        Write pending changes to the JSON file, if there are any.
+        """
+        if self._save_after_id is not None:
+            try:
+                self.master.after_cancel(self._save_after_id)
+            except Exception:
+                pass  # At exit the Tk interpreter may already be destroyed, taking the timer with it
+            self._save_after_id = None
+        if self._dirty:
+            self.save_config()
 
     def save_config(self):
         """
         Save the current configuration to the JSON file.
+
+        The file is written to a temporary path, synced once, and moved into place so an
+        interrupted write never leaves a truncated config behind.
         """
+        tmp_file = f"{self.config_file}.tmp"
         try:
-            with open(self.config_file, 'w') as file:
-                json.dump(self.config, file, indent=4)
+            with open(tmp_file, 'wb') as file:
+                file.write(_dumps(self.config))
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_file, self.config_file)
+            self._dirty = False
+            _unsaved_managers.discard(self)
         except IOError as e:
             print(f"Error saving config: {e}")
 
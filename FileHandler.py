@@ -1,20 +1,46 @@
 import os
+import logging
 from tkinter import filedialog, messagebox
 from typing import Optional
 
+try:
+    import xxhash
+
+    def _content_hash(content: str) -> int:
+        return xxhash.xxh64(content.encode('utf-8')).intdigest()
+except ImportError:
+    def _content_hash(content: str) -> int:
+        return hash(content)
+
+logger = logging.getLogger(__name__)
+
+# Number of characters encoded and written per os.write call when saving
+WRITE_CHUNK_SIZE = 65536
+
+def _write_all(fd: int, data: bytes) -> None:
+    """
+    Write all of `data` to a raw file descriptor, retrying on short writes.
+    """
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
 class FileHandler:
     def __init__(self):
         self.file_path: Optional[str] = None
-        self.last_content: str = ""
+        # Only a hash of the last opened or saved text is kept, not a copy of it
+        self.last_hash: int = _content_hash("")
         self.last_saved_time: float = 0.0
 
     def open_file_directly(self, file_path: str) -> Optional[str]:
         try:
             with open(file_path, 'r', encoding='utf-8') as file:
+                mtime = os.fstat(file.fileno()).st_mtime
                 content = file.read()
             self.file_path = file_path
-            self.last_content = content
-            self.last_saved_time = os.path.getmtime(file_path)
+            self.last_hash = _content_hash(content)
+            self.last_saved_time = mtime
             return content
         except Exception as e:
             # Handle exceptions here or pass them back
@@ -23,6 +49,8 @@ class FileHandler:
     def save(self, event=None):
         content = self.text.get('1.0', 'end-1c')
         if self.file_handler.save_file(content):
+            self.text.edit_modified(False)
+            self._last_saved_serial = self._edit_serial
             self.update_status_bar()
 
     def save_file(self, content: str) -> bool:
@@ -38,10 +66,26 @@ class FileHandler:
             if not self.file_path:
                 return False
         try:
-            with open(self.file_path, 'w', encoding='utf-8') as file:
-                file.write(content)
-            self.last_content = content
-            self.last_saved_time = os.path.getmtime(self.file_path)
+            # Write to a sibling temp file and swap it in, so a crash mid-save never truncates the original
+            tmp_path = f"{self.file_path}.tmp"
+            # Translate newlines the way a text-mode write would, as the editor's own save does
+            data = content.replace('\n', os.linesep) if os.linesep != '\n' else content
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+            try:
+                try:
+                    for i in range(0, len(data), WRITE_CHUNK_SIZE):
+                        _write_all(fd, data[i:i + WRITE_CHUNK_SIZE].encode('utf-8'))
+                    os.fsync(fd)
+                    mtime = os.fstat(fd).st_mtime
+                finally:
+                    os.close(fd)
+                os.replace(tmp_path, self.file_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            self.last_hash = _content_hash(content)
+            self.last_saved_time = mtime
             messagebox.showinfo("Saved", f"File saved at {self.file_path}")
             return True
         except PermissionError:
@@ -65,39 +109,65 @@ class FileHandler:
         """
         Check if the current content has been modified since last save.
 
+        Compares against the hash recorded at the last open or save rather than the full text.
+
         :param current_content: The current text content.
         :return: True if content has changed, False otherwise.
         """
-        return current_content != self.last_content
+        return _content_hash(current_content) != self.last_hash
 
     def reset_file_path(self):
         """
         Reset file path and related attributes when starting a new document.
         """
         self.file_path = None
-        self.last_content = ""
+        self.last_hash = _content_hash("")
         self.last_saved_time = 0.0
 
+    def bind_modified_tracking(self) -> None:
+        """
+        Track edits through Tk's <<Modified>> event so autosave never has to diff the buffer.
+
+        Every edit bumps `_edit_serial`; the buffer has unsaved changes while it differs
+        from `_last_saved_serial`.
+        """
+        self._edit_serial = 0
+        self._last_saved_serial = 0
+        self.text.bind('<<Modified>>', self._on_modified)
+
+    def _on_modified(self, event=None) -> None:
+        """
+        Record that the buffer changed and re-arm Tk's modified flag for the next edit.
+        """
+        if self.text.edit_modified():
+            self._edit_serial += 1
+            self.text.edit_modified(False)
+
+    def has_unsaved_edits(self) -> bool:
+        """
+        Check whether any edit has been recorded since the last save, without touching the buffer.
+        """
+        return self._edit_serial != self._last_saved_serial
+
     def check_for_changes(self) -> None:
-        print("Checking for changes")
-        current_content = self.text.get('1.0', tk.END)
-        if self.file_handler.is_modified(current_content):
-            print("Changes detected, saving")
+        if self.has_unsaved_edits():
+            logger.debug("Changes detected, saving")
             self.save()
-            self.file_handler.last_content = current_content
+            self._last_saved_serial = self._edit_serial
         
         # Schedule next check
-        print(f"Scheduling next check in {self.autosave_delay} ms")
         self.master.after(self.autosave_delay, self.check_for_changes)
 
     def close_file(self) -> None:
-        if self.file_handler.is_modified(self.text.get('1.0', tk.END)):
+        # Tk keeps the modified flag for us; no need to copy the buffer out just to compare it.
+        # Only one dialog is shown: the save prompt if there are changes, else the quit confirmation.
+        if self.has_unsaved_edits() or self.text.edit_modified():
             choice = messagebox.askyesnocancel("Unsaved Changes", "You have unsaved changes. Do you want to save before quitting?")
             if choice is None:
                 return  # User cancelled, do not close
             elif choice:
                 self.save()
-        
-        # Ask for confirmation to exit
-        if messagebox.askokcancel("Quit", "Do you really want to quit?"):
-            self.master.destroy()
\ No newline at end of file
+        elif not messagebox.askokcancel("Quit", "Do you really want to quit?"):
+            return
+
+        self.master.destroy()
\ No newline at end of file
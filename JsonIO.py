@@ -0,0 +1,59 @@
+# JsonIO.py
+
+"""
+JSON encoding shared by the editor, ConfigManager and ThemeManager.
+
+orjson is used when it is installed, then ujson, then the standard library. Every
+backend's decode error is a ValueError, so callers catch that rather than a
+backend-specific exception.
+"""
+
+import mmap
+import os
+from typing import Any
+
+try:
+    import orjson
+
+    def loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    orjson = None
+    try:
+        import ujson as json
+    except ImportError:
+        import json
+
+    def loads(data: bytes) -> Any:
+        return json.loads(data)
+
+    def dumps(obj: Any) -> bytes:
+        # Laid out like orjson's output, so saved files do not change with the installed backend
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+# Files at least this large are parsed by orjson straight from a memory map; below it,
+# setting up the mapping costs more than the copy it saves
+MMAP_MIN_BYTES = 1 << 16
+
+def read_json(path: str) -> Any:
+    """
+    Read and parse a JSON file.
+
+    The parser is handed raw bytes and decodes the UTF-8 itself. The file is opened
+    unbuffered, so read() sizes a single buffer from fstat and fills it straight from the
+    descriptor; orjson, which parses any buffer, gets large files as a memory map instead,
+    never copied into a bytes object at all.
+
+    :param path: Path to the JSON file
+    :return: The decoded JSON content
+    :raises FileNotFoundError: If the file does not exist.
+    :raises ValueError: If the file is not valid JSON.
+    """
+    with open(path, 'rb', buffering=0) as file:
+        if orjson is not None and os.fstat(file.fileno()).st_size >= MMAP_MIN_BYTES:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                return orjson.loads(view)
+        return loads(file.read())
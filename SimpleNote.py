@@ -5,26 +5,182 @@ FileHandler.py
 KeybindingsManager.py
 ThemeManager.py
     themes.json
+UndoStack.py
 """
 
 import os
 import time
-import json
 import sys
 import tkinter as tk
-import tkinterdnd2 as tkdnd
+try:
+    import tkinterdnd2 as tkdnd
+except ImportError:
+    tkdnd = None  # Drag and drop is optional; the editor runs on a plain Tk root without it
 import logging
-
-from typing import Dict, Optional, Union, Callable, Any, Literal, List
+import functools
+import hashlib
+import codecs
+import io
+import threading
+import queue
+import re
+import bisect
+import shutil
+
+from typing import Dict, Optional, Union, Callable, Any, Literal, List, Tuple
 
 from tkinter import Menu, Text, messagebox, filedialog, simpledialog, Toplevel, Label, Entry, Button, font as tkFont
+from tkinter.colorchooser import askcolor
 from tkinter import ttk
 
-from tkcalendar import Calendar
 from ConfigManager import ConfigManager
 from KeybindingsManager import bind_keyboard_shortcuts
-from CalendarManager import open_calendar, close_calendar
+from CalendarManager import open_calendar
 from StatusBar import StatusBar
+from UndoStack import UndoStack, compute_tk_delta
+from JsonIO import read_json
+from ThemeManager import intern_themes
+
+# Write errors to a file; configured once per process rather than per editor
+logging.basicConfig(filename='simple_note.log', level=logging.ERROR,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+# "1\n2\n...N\n" for the line-number bar, grown on demand; _LINE_NUM_OFFSETS[i] is where
+# line i's number starts, so the numbers for any run of lines are a single slice
+_LINE_NUM_STR: str = ""
+_LINE_NUM_OFFSETS: List[int] = [0, 0]
+
+def _line_numbers_text(first: int, last: int) -> str:
+    """
+    Return the line-number bar text for lines `first` through `last`, one number per line.
+
+    :param first: First line number, starting at 1
+    :param last: Last line number
+    :return: A slice of the shared cache, e.g. "3\n4\n5\n"
+    """
+    global _LINE_NUM_STR
+    high = len(_LINE_NUM_OFFSETS) - 2
+    if last > high:
+        numbers = [f"{i}\n" for i in range(high + 1, last + 1)]
+        offset = len(_LINE_NUM_STR)
+        for number in numbers:
+            offset += len(number)
+            _LINE_NUM_OFFSETS.append(offset)
+        _LINE_NUM_STR += "".join(numbers)
+    return _LINE_NUM_STR[_LINE_NUM_OFFSETS[first]:_LINE_NUM_OFFSETS[last + 1]]
+
+def configure_if_changed(widget: tk.Misc, **options: Any) -> None:
+    """
+    Configure only the options whose current value differs from the requested one.
+
+    Reconfiguring a widget makes Tk redisplay it even when nothing changed, so
+    unchanged options are filtered out with cget first.
+
+    :param widget: The widget to configure.
+    :param options: Option names and their new values.
+    """
+    changed = {name: value for name, value in options.items() if widget.cget(name) != value}
+    if changed:
+        widget.configure(**changed)
+
+def _content_digest(content: str) -> bytes:
+    """
+    Return a short digest of the text, used to tell whether it differs from what was last saved.
+
+    :param content: The text content.
+    :return: A 16-byte BLAKE2b digest.
+    """
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+
+# Style tags the user can toggle; their order defines the bits of a "style_<mask>" tag
+STYLE_TAGS = ("bold", "italic", "underline")
+
+# Lines read per Text.get call when counting words
+WORD_COUNT_BLOCK_LINES = 1000
+
+# Leading indentation of a line, and the "\n" + spaces strings Enter inserts for common depths
+_LEADING_WS = re.compile(r'[ \t]*')
+_NEWLINE_INDENTS: Tuple[str, ...] = tuple('\n' + ' ' * depth for depth in range(65))
+
+# Characters outside the Basic Multilingual Plane; Tcl 8.6 keeps them as surrogate pairs,
+# so in Tk indices each one counts as two characters
+_NON_BMP = re.compile('[\U00010000-\U0010FFFF]')
+
+# Bytes read per call when loading a file, and characters buffered before each insert
+READ_CHUNK_SIZE = 1 << 20
+INSERT_BATCH_CHARS = 4 << 20
+
+# Bytes handed to each os.write call when saving
+WRITE_CHUNK_BYTES = 1 << 20
+
+# How often the Tk thread collects results from worker threads while any are running,
+# and how many results they may queue before waiting for it (bounding a load's lead)
+WORKER_POLL_MS = 20
+WORKER_QUEUE_SIZE = 4
+
+@functools.lru_cache(maxsize=8)
+def _load_json_cached(path: str, mtime_ns: int) -> Any:
+    """
+    Parse a JSON file, reusing the decoded result while its modification time is unchanged.
+
+    The returned object is shared between callers and must not be mutated.
+
+    :param path: Path to the JSON file
+    :param mtime_ns: The file's st_mtime_ns, part of the cache key so edits invalidate it
+    :return: The decoded JSON content
+    """
+    return read_json(path)
+
+def load_json(path: str) -> Any:
+    """
+    Load a JSON file through the mtime-keyed cache.
+
+    :param path: Path to the JSON file
+    :return: The decoded JSON content
+    :raises FileNotFoundError: If the file does not exist.
+    :raises ValueError: If the file is not valid JSON.
+    """
+    return _load_json_cached(path, os.stat(path).st_mtime_ns)
+
+@functools.lru_cache(maxsize=64)
+def _get_font(family: str, size: int, weight: str = "normal", slant: str = "roman", underline: bool = False) -> tkFont.Font:
+    """
+    Return a shared Tk font for the given attributes, creating it on first use.
+
+    :param family: Font family name
+    :param size: Font size in points
+    :param weight: "normal" or "bold"
+    :param slant: "roman" or "italic"
+    :param underline: Whether the font is underlined
+    :return: The cached font object
+    """
+    return tkFont.Font(family=family, size=size, weight=weight, slant=slant, underline=underline)
+
+def _style_font(family: str, size: int, mask: int) -> tkFont.Font:
+    """
+    Return the shared font for a combination of styles, where bit i of `mask` stands for STYLE_TAGS[i].
+
+    Every caller passes the same full argument list, so equal fonts share one _get_font
+    cache entry: the eight variants of a (family, size) are created once.
+
+    :param family: Font family name
+    :param size: Font size in points
+    :param mask: Bitmask of the bold, italic and underline styles
+    :return: The cached font object
+    """
+    return _get_font(family, size, "bold" if mask & 1 else "normal",
+                     "italic" if mask & 2 else "roman", bool(mask & 4))
+
+@functools.lru_cache(maxsize=1)
+def _font_families() -> frozenset:
+    """
+    Return the installed font family names, asking Tk (and the system font manager) only once.
+
+    Call `_font_families.cache_clear()` to rescan, e.g. after fonts were installed.
+
+    :return: The family names
+    """
+    return frozenset(tkFont.families())
 
 def load_config(config_file: str = "config.json") -> Dict[str, Union[int, str]]:
     """
@@ -36,9 +192,8 @@ def load_config(config_file: str = "config.json") -> Dict[str, Union[int, str]]:
     :return: A dictionary with configuration settings
     """
     try:
-        with open(config_file, 'r') as file:
-            return json.load(file)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
+        return load_json(config_file)
+    except (FileNotFoundError, ValueError) as e:
         # Log the error for debugging
         print(f"Error loading config: {e}")
         # Return default configuration if file is missing or corrupted
@@ -58,7 +213,7 @@ class TextEditor:
         Sets up the basic configuration, UI elements, event bindings, and status bar scheduler.
         """
         self.master = master
-        self.config_manager = ConfigManager()
+        self.config_manager = ConfigManager(master=self.master)
         self.config: Dict[str, Union[int, str]] = self.config_manager.config
         self.master.title('Simple Note')
 
@@ -91,9 +246,10 @@ class TextEditor:
         self.status_bar.update_status_bar(file_path=None, word_count=0)
     
         # Autosave configuration
-        self.autosave_delay: int = self.config_manager.get("autosave_delay", 60000)
-        print(f"Autosave delay set to {self.autosave_delay}")
-        self.master.after(self.autosave_delay, self.check_for_changes)
+        self.autosave_delay: int = getattr(self.config_manager, "autosave_delay", 60000)
+        logging.debug("Autosave delay set to %s", self.autosave_delay)
+        # Pending autosave, scheduled by the first edit after a save or an autosave check
+        self._autosave_after_id: Optional[str] = None
 
         # Font settings
         self.font_family: str = "Arial"
@@ -109,9 +265,10 @@ class TextEditor:
         self.create_text_widget()
         self.text.focus_set()  # Focus on the text widget for immediate input
 
-        self.set_theme(self.current_theme)  # Call set_theme after all attributes are initialized
-
         self.find_replace_open = False  # Flag to check if find/replace dialog is open
+        self._find_replace_window: Optional[Toplevel] = None  # The find/replace dialog once built; hidden while closed
+        self._find_entry: Optional[Entry] = None
+        self._find_replace_widgets: List[tk.Widget] = []
 
         # key bindings
         self.bind_keyboard_shortcuts = lambda: bind_keyboard_shortcuts(self)
@@ -122,41 +279,67 @@ class TextEditor:
         # File management attributes
         self.file_path: Optional[str] = None
         self.last_saved_time: float = time.time()
-        self.last_content: str = ""
+        self._last_saved_digest: bytes = _content_digest("")  # Digest of the text as last opened or saved
+        # Edits are counted in a <<Modified>> handler that re-arms Tk's modified flag,
+        # so unsaved changes are tracked here rather than by text.edit_modified()
+        self._edit_serial: int = 0
+        self._last_saved_serial: int = 0
+        self._last_autosave_serial: int = 0  # Edit serial at the last autosave check that found changes
+        self._word_count: int = 0
+        self._word_count_serial: Optional[int] = None  # Edit serial _word_count was taken at
+        # Saves write on a worker thread; the lock is held while a write is in flight
+        self._save_lock = threading.Lock()
+        self._save_requested: bool = False  # A save was asked for while another was still writing
+        self._save_requested_autosave: bool = False  # ...and every such request was an autosave
+
+        # Style toggles waiting for their font update, merged into one range
+        self._style_refresh_range: Optional[Tuple[str, str]] = None
+        self._style_refresh_scheduled: bool = False
+
+        # Set while a file is being read in the background
+        self._loading_file: bool = False
+
+        # Worker threads never call into Tk; they queue (callback, args) for the Tk thread,
+        # which drains the queue from an after() poll while any worker is running
+        self._worker_results: queue.Queue = queue.Queue(WORKER_QUEUE_SIZE)
+        self._workers_running: int = 0
+        self._worker_poll_id: Optional[str] = None
 
         # Line number updating
-        self.update_line_number_delay: int = 100
         self.update_line_number_scheduled: bool = False
+        self._rendered_line_count: int = 0  # Line numbers currently shown in the bar
 
         # Calendar window management
         self.calendar_window = None  # Make sure this is initialized here
 
-        # Enable drag and drop for files
-        self.master.drop_target_register(tkdnd.DND_FILES)
-        self.master.dnd_bind('<<Drop>>', self.drop)
+        # Enable drag and drop for files when the root window supports it
+        if tkdnd is not None and hasattr(self.master, 'drop_target_register'):
+            self.master.drop_target_register(tkdnd.DND_FILES)
+            self.master.dnd_bind('<<Drop>>', self.drop)
+
+        # Enumerate the installed fonts once the window is up, ahead of the first font change
+        self.master.after_idle(_font_families)
+
+        # Refocus the text widget after the window is resized
+        self._refocus_scheduled: bool = False
+        self.master.bind("<Configure>", self._on_configure)
 
         # Undo/Redo buffer configuration
         self.max_undo_stack_size = 50  # You can adjust this to limit the number of undo actions
-        self.undo_stack = []
-        self.redo_stack = []
-
-        self.master.update_idletasks()
+        self.undo_stack = UndoStack(self.max_undo_stack_size)
+        self.redo_stack = UndoStack(self.max_undo_stack_size)
+        self._last_undo_hash: Optional[int] = None  # hash of undo_stack[-1], if any
+        # Return/Backspace presses closer together than this share one undo snapshot
+        self.undo_coalesce_delay: int = 500
+        self._undo_burst_after_id: Optional[str] = None
+
+        # set_window_size only reads the screen size, which needs no pending idle tasks
         self.set_window_size()
 
-        self.set_theme(self.current_theme)  # Call set_theme after all attributes are initialized
+        # Apply the theme once, after every themed widget (including the menu) exists
+        self.set_theme(self.current_theme)
 
 
-        #logging
-        self.setup_logging()
-
-    def setup_logging(self) -> None:
-        """Configure logging to write errors to a file."""
-        # Set up basic configuration for logging errors
-        logging.basicConfig(filename='simple_note.log', level=logging.ERROR,
-                            format='%(asctime)s - %(levelname)s - %(message)s')
-
-    
-
     def open_file_directly(self, file_path: str):
             """
             Open and read the contents of a file into the text widget.
@@ -166,79 +349,278 @@ class TextEditor:
             :param file_path: Path to the file to open
             """
             try:
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    content = file.read()
-                
-                self.text.delete('1.0', 'end')
-                self.text.insert('1.0', content)
+                # The text is read on a worker thread; _on_file_loaded finishes the open
+                self._load_file_async(file_path)
                 
-                self.file_path = file_path
-                self.last_content = content
-                self.last_saved_time = time.time()
-                self.status_bar.update_status_bar(file_path, len(self.text.get('1.0', 'end-1c').split()))
-                
-            except PermissionError as e:
-                messagebox.showerror("Error", "Permission denied. You do not have the rights to read this file.")
-                logging.error(f"Permission denied. You do not have the rights to read this file: {e}")
-            except FileNotFoundError as e:
-                messagebox.showerror("Error", "File not found. Please check the file path.")
-                logging.error(f"File not found. Please check the file path: {e}")
-            except IOError as e:
-                messagebox.showerror("Error", f"An error occurred while reading the file: {e}")
-                logging.error(f"An error occurred while reading the file: {e}")
+            except OSError as e:
+                if isinstance(e, PermissionError):
+                    message = "Permission denied. You do not have the rights to read this file."
+                elif isinstance(e, FileNotFoundError):
+                    message = "File not found. Please check the file path."
+                else:
+                    message = f"An error occurred while reading the file: {e}"
+                messagebox.showerror("Error", message)
+                logging.exception(message)
             except Exception as e:
                 messagebox.showerror("Error", f"An unexpected error occurred: {e}")
-                logging.error(f"An unexpected error occurred: {e}")
+                logging.exception("An unexpected error occurred while opening a file")
+
+    def _load_file_async(self, file_path: str) -> None:
+        """
+        Replace the text widget's contents with a UTF-8 file read on a worker thread.
+
+        The file is opened here, so a missing or unreadable file raises to the caller right
+        away. A worker thread then reads, decodes and digests it, queueing the text for the
+        Tk thread in batches; the widget is read-only and shows a busy cursor until
+        `_on_file_loaded` or `_on_file_load_failed` runs. Opens requested meanwhile are refused.
+
+        :param file_path: Path to the file to load
+        :raises OSError: If the file cannot be opened.
+        """
+        if self._loading_file:
+            self.master.bell()
+            return
+        file = open(file_path, 'rb', buffering=0)
+        self._loading_file = True
+        # Kept so a decode error halfway through can put the previous document back
+        previous = self.text.get('1.0', 'end-1c')
+        self.text.delete('1.0', 'end')
+        # Tk's undo log would otherwise keep a second copy of every inserted batch
+        self.text.configure(state='disabled', cursor='watch', undo=False)
+        self.status_bar.configure(text=f"Loading {file_path}...")
+        self._start_worker(self._read_file_in_background, file, file_path, previous)
+
+    def _read_file_in_background(self, file, file_path: str, previous: str) -> None:
+        """
+        Worker thread body: decode the file and pass it to the Tk thread in INSERT_BATCH_CHARS pieces.
+
+        The file is read READ_CHUNK_SIZE bytes at a time into one reused buffer. Newlines are
+        translated as text-mode reads do, and the digest is accumulated along the way so the
+        whole text is never held at once.
+        """
+        decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(), translate=True)
+        digest = hashlib.blake2b(digest_size=16)
+        chunk = bytearray(READ_CHUNK_SIZE)
+        view = memoryview(chunk)
+        pending: List[str] = []
+        pending_chars = 0
+
+        def hand_over() -> None:
+            nonlocal pending_chars
+            text = "".join(pending)
+            digest.update(text.encode('utf-8'))
+            self._worker_results.put((self._insert_loaded_text, (text,)))
+            pending.clear()
+            pending_chars = 0
+
+        try:
+            with file:
+                while True:
+                    n = file.readinto(chunk)
+                    decoded = decoder.decode(view[:n], final=not n)
+                    if decoded:
+                        pending.append(decoded)
+                        pending_chars += len(decoded)
+                    if not n:
+                        break
+                    if pending_chars >= INSERT_BATCH_CHARS:
+                        hand_over()
+            hand_over()
+            self._worker_results.put((self._on_file_loaded, (file_path, digest.digest())))
+        except Exception as e:
+            self._worker_results.put((self._on_file_load_failed, (e, previous)))
+
+    def _start_worker(self, target: Callable[..., None], *args: Any) -> None:
+        """
+        Run `target(*args)` on a daemon thread, collecting what it queues until it returns.
+
+        The target hands work back to the Tk thread by putting (callback, args) on
+        `_worker_results`; it must not touch Tk itself.
+
+        :param target: The worker thread body.
+        :param args: Arguments for `target`.
+        """
+        def run() -> None:
+            try:
+                target(*args)
+            finally:
+                self._worker_results.put(None)  # Tells the poll this worker is done
+
+        self._workers_running += 1
+        threading.Thread(target=run, daemon=True).start()
+        if self._worker_poll_id is None:
+            self._worker_poll_id = self.master.after(WORKER_POLL_MS, self._drain_worker_results)
+
+    def _drain_worker_results(self) -> None:
+        """
+        Run the callbacks worker threads have queued, on the Tk thread, and poll again while any is running.
+
+        Only what was queued when the poll fired is handled, so a worker that keeps the
+        queue full cannot hold the Tk thread in here and starve user input.
+        """
+        self._worker_poll_id = None
+        try:
+            for _ in range(self._worker_results.qsize()):
+                item = self._worker_results.get_nowait()
+                if item is None:
+                    self._workers_running -= 1
+                else:
+                    callback, args = item
+                    callback(*args)
+        finally:
+            # A callback may have started a worker, and with it a new poll
+            if self._workers_running and self._worker_poll_id is None:
+                self._worker_poll_id = self.master.after(WORKER_POLL_MS, self._drain_worker_results)
+
+    def _insert_loaded_text(self, text: str) -> None:
+        """
+        Append a batch of a file being loaded to the (read-only while loading) text widget.
+        """
+        self.text.configure(state='normal')
+        self.text.insert('end-1c', text)
+        self.text.configure(state='disabled')
+
+    def _end_file_load(self) -> None:
+        """
+        Make the text widget editable again after a file load finishes or fails.
+
+        Tk's undo history is reset, so the load itself cannot be undone back to an empty buffer.
+        """
+        self._loading_file = False
+        self.text.configure(state='normal', cursor='xterm', undo=True)
+        self.text.edit_reset()
+
+    def _on_file_loaded(self, file_path: str, digest: bytes) -> None:
+        """
+        Finish opening a file on the Tk thread once all of its text is in the widget.
+
+        :param file_path: The file that was loaded.
+        :param digest: The `_content_digest` of the loaded text.
+        """
+        self._end_file_load()
+        self.file_path = file_path
+        self._last_saved_digest = digest
+        # The load's own inserts bumped the edit serial; the loaded text is the saved text
+        self._last_saved_serial = self._last_autosave_serial = self._edit_serial
+        if self._autosave_after_id is not None:
+            self.master.after_cancel(self._autosave_after_id)
+            self._autosave_after_id = None
+        self.last_saved_time = time.time()
+        self.status_bar.update_status_bar(file_path, self.count_words())
+
+    def _on_file_load_failed(self, error: Exception, previous: str) -> None:
+        """
+        Put the previous document back and report why a file could not be loaded.
+
+        :param error: The exception raised while reading or decoding the file.
+        :param previous: The text the widget held before the load started.
+        """
+        self._end_file_load()
+        self.text.delete('1.0', 'end')
+        self.text.insert('1.0', previous)
+        self.status_bar.update_status_bar(self.file_path, self.count_words())
+        if isinstance(error, UnicodeDecodeError):
+            message = "The file is not valid UTF-8 text."
+        else:
+            message = f"An error occurred while reading the file: {error}"
+        messagebox.showerror("Error", message)
+        logging.error("%s (%r)", message, error)
 
     def drop(self, event):
         """
         Handle file drag and drop event.
 
-        Checks if the dropped item is a file and opens it if so.
+        Opens the first dropped item that is a file.
         """
-        file_path = event.data.replace('{', '').replace('}', '')
-        if os.path.isfile(file_path):
-            self.open_file_directly(file_path)
-        else:
-            messagebox.showerror("Error", "The dropped item is not a file.")
+        # The drop data is a Tcl list: paths with spaces are braced, several paths are space-separated
+        for file_path in self.master.tk.splitlist(event.data):
+            if os.path.isfile(file_path):
+                self.open_file_directly(file_path)
+                return
+        messagebox.showerror("Error", "The dropped item is not a file.")
+
+    def _tk_length(self, text: str, start: int = 0, end: Optional[int] = None) -> int:
+        """
+        Return the length of `text[start:end]` in Tk index characters.
+
+        Python offsets count code points, but Tcl 8.6 counts every non-BMP character
+        (emoji and the like) as two, so offsets must go through here before being used
+        in "+Nc" or "line.column" indices.
 
-    def _handle_undo_redo(self, stack_to_pop: List[str], stack_to_push: List[str]) -> None:
+        :param text: The string the offsets refer to.
+        :param start: Start offset in code points.
+        :param end: End offset in code points; defaults to the end of `text`.
+        :return: The number of Tk index characters in the span.
+        """
+        if end is None:
+            end = len(text)
+        length = end - start
+        if self._tk_counts_surrogates:
+            length += len(_NON_BMP.findall(text, start, end))
+        return length
+
+    def _handle_undo_redo(self, stack_to_pop: UndoStack, stack_to_push: UndoStack) -> None:
         """Handle the logic for undo or redo actions."""
         if stack_to_pop:
              # Save current state before applying undo/redo
             current_state = self.text.get("1.0", tk.END)
             stack_to_push.append(current_state)
             new_state = stack_to_pop.pop()
-            # Replace current text with the state from the undo/redo stack
-            self.text.delete("1.0", tk.END)
-            self.text.insert("1.0", new_state)
-            self.text.edit_modified(False)  # Mark as unmodified
+            # Rewrite only the span that differs from the state on the undo/redo stack,
+            # kept before the final newline that Tk's insert and delete never move
+            offset, removed, inserted = compute_tk_delta(current_state, new_state)
+            start = f"1.0+{self._tk_length(current_state, 0, offset)}c"
+            if removed:
+                self.text.delete(start, f"{start}+{self._tk_length(removed)}c")
+            if inserted:
+                self.text.insert(start, inserted)
+            top = self.undo_stack.peek()
+            self._last_undo_hash = None if top is None else hash(top)
 
     def custom_undo(self) -> None:
         if self.undo_stack:
             self._handle_undo_redo(self.undo_stack, self.redo_stack)
         else:
-            messagebox.showinfo("Undo", "No further undo actions available.")
+            self.master.bell()  # Nothing to undo; avoid a modal dialog on key autorepeat
 
     def custom_redo(self) -> None:
         if self.redo_stack:
             self._handle_undo_redo(self.redo_stack, self.undo_stack)
         else:
-            messagebox.showinfo("Redo", "No further redo actions available.")
+            self.master.bell()  # Nothing to redo
 
     def save_undo_state(self) -> None:
         """Save current text state in the undo stack."""
         current_state = self.text.get("1.0", tk.END)
-        if not self.undo_stack or current_state != self.undo_stack[-1]:
+        state_hash = hash(current_state)
+        # Compare hashes rather than the full text against the last snapshot
+        if state_hash != self._last_undo_hash:
             self.undo_stack.append(current_state)
-            if len(self.undo_stack) > self.max_undo_stack_size:
-                self.undo_stack.pop(0)  # Remove the oldest if buffer exceeds max size
+            self._last_undo_hash = state_hash  # UndoStack drops the oldest snapshot past its maxlen
             self.redo_stack.clear()  # Clear redo stack when new action is performed
 
+    def save_undo_state_coalesced(self) -> None:
+        """
+        Save an undo snapshot before the first keystroke of a burst of edits.
+
+        Later keystrokes within `undo_coalesce_delay` ms of the previous one extend the
+        burst instead of taking another full-buffer snapshot.
+        """
+        if self._undo_burst_after_id is None:
+            self.save_undo_state()
+        else:
+            self.master.after_cancel(self._undo_burst_after_id)
+        self._undo_burst_after_id = self.master.after(self.undo_coalesce_delay, self._end_undo_burst)
+
+    def _end_undo_burst(self) -> None:
+        """Let the next keystroke start a new undo snapshot."""
+        self._undo_burst_after_id = None
+
     def clear_undo_redo(self) -> None:
         """Clear both undo and redo stacks."""
         self.undo_stack.clear()
         self.redo_stack.clear()
+        self._last_undo_hash = None
         messagebox.showinfo("Undo/Redo", "Undo/Redo history has been cleared.")
 
 
@@ -272,11 +654,8 @@ class TextEditor:
         """
         theme_file = "themes.json"
         try:
-            # Try to open and read the themes file
-            with open(theme_file, 'r') as file:
-                # Parse JSON content into a dictionary
-                return json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError):
+            return intern_themes(load_json(theme_file))
+        except (FileNotFoundError, ValueError):
             # If the file is missing or invalid, inform the user and use default theme
             messagebox.showerror("Error", "Themes file not found or corrupted. Using light theme.")
             
@@ -312,22 +691,6 @@ class TextEditor:
                 }
             }
 
-    def set_system_theme(self):
-            """
-            Set the theme based on the operating system.
-
-            This method applies:
-            - Light theme for Windows ('nt' OS),
-            - Dark theme for other operating systems.
-
-            Note: This assumes that `self.light_theme` and `self.dark_theme` are already defined in __init__.
-            """
-            # Check if the current OS is Windows
-            if os.name == 'nt':  # 'nt' is the string returned by os.name for Windows
-                self.set_theme(self.light_theme)  # Apply light theme for Windows
-            else:
-                self.set_theme(self.dark_theme)  # Apply dark theme for other systems (e.g., macOS, Linux)
-
     def set_window_size(self) -> None:
         """
         Configure the initial size and position of the main window to center it on the screen,
@@ -376,7 +739,7 @@ class TextEditor:
         - Adds padding to the text widget to prevent text from touching the edges
         """
         # Define the font to be used in the text widgets
-        font = tkFont.Font(family=self.font_family, size=self.font_size)
+        font = _style_font(self.font_family, self.font_size, 0)
 
         # Set up the line number bar, but hide it by default
         self.line_number_bar = Text(self.text_frame, 
@@ -396,34 +759,21 @@ class TextEditor:
                         highlightthickness=0, bd=0,
                         padx=10, pady=10)  # Add padding here
         self.text.pack(side=tk.LEFT, expand=True, fill=tk.BOTH)
+        # Whether this Tcl counts non-BMP characters twice (8.6) or once (8.7 and later)
+        self._tk_counts_surrogates: bool = int(self.text.tk.call('string', 'length', '\U0001F600')) == 2
 
-        # Bind mouse wheel events for scrolling on both text and line number widgets
-        self.text.bind('<MouseWheel>', self.on_scroll)
+        # The text widget scrolls natively and reports through yscrollcommand; the line number
+        # bar forwards its mouse wheel events to the text widget
         self.line_number_bar.bind('<MouseWheel>', self.on_scroll)
 
-        # Configure text styling tags
-        # Bold
-        bold_font = font.copy()
-        bold_font.configure(weight="bold", size=self.font_size)
-        self.text.tag_configure("bold", font=bold_font)
-        
-        # Italic
-        italic_font = font.copy()
-        italic_font.configure(slant="italic", size=self.font_size)
-        self.text.tag_configure("italic", font=italic_font)
-        
-        # Underline
-        underline_font = font.copy()
-        underline_font.configure(underline=True, size=self.font_size)
-        self.text.tag_configure("underline", font=underline_font)
-
-        # Normal (default) font configuration
-        self.text.tag_configure("normal", font=font)
+        # Configure the normal, single-style and combined-style tags
+        self._configure_fonts()
+        # The (family, size) the widget and tags were last configured with
+        self._applied_font: Tuple[str, int] = (self.font_family, self.font_size)
 
         # Bind events for updating line numbers
-        # This will trigger on any key press or text modification
-        self.text.bind('<Any-KeyPress>', self.delayed_update_line_numbers)
-        self.text.bind('<<Modify>>', self.delayed_update_line_numbers)
+        # This triggers on actual edits only, not on every key press
+        self.text.bind('<<Modified>>', self.on_text_modified)
 
         # Bind key events for auto-indentation
         self.text.bind('<Return>', self.on_enter_pressed)
@@ -433,16 +783,16 @@ class TextEditor:
         # Configure indentation tag for visual representation of code indentation
         self.text.tag_config('indent', tabs=('0.5c',))
 
-        self.style.configure("Vertical.TScrollbar", 
-                            background=self.current_theme.get("scrollbar_background", "#D3D3D3"),
-                            troughcolor=self.current_theme.get("scrollbar_trough", "#FFFFFF"),
-                            bordercolor=self.current_theme.get("scrollbar_border", "#A9A9A9"),
-                            arrowcolor=self.current_theme.get("scrollbar_arrow", "#000000"))
+        self._scrollbar_style: Optional[Tuple[str, str, str, str]] = None  # Colors last given to the ttk style
+        self._configure_scrollbar_style(self.current_theme)
 
         # Create the scrollbar with the custom style
         self.scrollbar = ttk.Scrollbar(self.text_frame, orient="vertical", style="Vertical.TScrollbar", command=self.text.yview)
         self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y, expand=True)
-        self.text.config(yscrollcommand=self.scrollbar.set)
+        # Latest position reported to _sync_scroll, applied to the line number bar at idle
+        self._scroll_sync_first: str = "0.0"
+        self._scroll_sync_pending: bool = False
+        self.text.config(yscrollcommand=self._sync_scroll)
 
     def on_enter_pressed(self, event: tk.Event) -> Literal['break']:
         """
@@ -454,14 +804,15 @@ class TextEditor:
         :param event: The Tkinter event object for the key press.
         :return: 'break' to prevent further event processing.
         """
-        self.save_undo_state()
+        self.save_undo_state_coalesced()
         # Get the content of the current line
         current_line: str = self.text.get('insert linestart', 'insert lineend')
-        # Calculate the number of spaces from the start of the line
-        indent_level: int = len(current_line) - len(current_line.lstrip())
+        # Calculate the number of spaces from the start of the line in a single scan
+        indent_level: int = _LEADING_WS.match(current_line).end()
 
         # Insert a new line with the calculated indentation
-        self.text.insert('insert', '\n' + ' ' * indent_level)
+        self.text.insert('insert', _NEWLINE_INDENTS[indent_level] if indent_level < len(_NEWLINE_INDENTS)
+                         else '\n' + ' ' * indent_level)
         return 'break'  # Prevent further event propagation
     """
     def on_tab_pressed(self, event: tk.Event) -> Literal['break']:
@@ -482,7 +833,7 @@ class TextEditor:
         :param event: The Tkinter event object for the key press.
         :return: 'break' to prevent further event processing if indentation was removed, None otherwise.
         """
-        self.save_undo_state()
+        self.save_undo_state_coalesced()
 
         # Get cursor position
         cursor_pos = self.text.index('insert')
@@ -509,13 +860,15 @@ class TextEditor:
         # If cursor not at line start, let default backspace behavior occur
         return None
         
-    def on_scroll(self, *args: Any) -> None:
+    def on_scroll(self, *args: Any) -> Optional[Literal['break']]:
         """
-        Synchronize the scrolling between the main text widget and the line number bar.
+        Scroll the main text widget on behalf of another widget, such as the line number bar.
 
         This function handles both mouse wheel scrolling and programmatic scrolling events.
+        The line number bar follows through `_sync_scroll`.
 
         :param args: The event arguments, which can either be a Tkinter event or scroll command args.
+        :return: 'break' for mouse wheel events so the source widget doesn't also scroll itself.
         """
         # Check if the scroll event is from a mouse wheel
         if isinstance(args[0], tk.Event):
@@ -523,63 +876,133 @@ class TextEditor:
             scroll_units = int(-1 * (args[0].delta / 120))  # -1 for reverse scrolling on Windows
             # Scroll the text widget
             self.text.yview('scroll', scroll_units, 'units')
-        else:
-            # If not a mouse event, use the passed scroll command
-            self.text.yview(*args)  # type: ignore[arg-type]
+            return 'break'
+        # If not a mouse event, use the passed scroll command
+        self.text.yview(*args)  # type: ignore[arg-type]
+        return None
+
+    def _sync_scroll(self, first: str, last: str) -> None:
+        """
+        Handle the text widget's yscrollcommand: update the scrollbar and move the
+        line number bar to the same position.
+
+        A fast wheel spin calls this many times per frame, so the line number bar is moved
+        once, to the latest position, when Tk goes idle.
+
+        :param first: Fraction of the text above the visible area.
+        :param last: Fraction of the text at the bottom of the visible area.
+        """
+        self.scrollbar.set(first, last)
+        self._scroll_sync_first = first
+        if not self._scroll_sync_pending:
+            self._scroll_sync_pending = True
+            self.master.after_idle(self._sync_line_numbers_scroll)
+
+    def _sync_line_numbers_scroll(self) -> None:
+        """
+        Move the line number bar to the text widget's last reported scroll position.
+        """
+        self._scroll_sync_pending = False
+        self.line_number_bar.yview_moveto(self._scroll_sync_first)
+
+    def on_text_modified(self, event=None) -> None:
+        """
+        Handle Tk's <<Modified>> event for the main text widget.
 
-        # Synchronize the line number bar with the text widget's scroll position
-        self.line_number_bar.yview_moveto(self.text.yview()[0])
+        Tk only fires the event when the modified flag flips, so the flag is cleared again
+        here to be notified of the next edit; the edit is recorded in `_edit_serial`
+        and an autosave is scheduled if none is pending.
+
+        :param event: Optional event object from the <<Modified>> virtual event.
+        """
+        if not self.text.edit_modified():
+            return  # Triggered by clearing the flag
+        self._edit_serial += 1
+        self.text.edit_modified(False)
+        if self._autosave_after_id is None:
+            self._autosave_after_id = self.master.after(self.autosave_delay, self.check_for_changes)
+        self.delayed_update_line_numbers()
+
+    def count_words(self) -> int:
+        """
+        Count the words in the text widget without copying the whole buffer at once.
+
+        Words never span lines, so the text is read and split in blocks of whole lines,
+        keeping the transient strings bounded by the block size.
+
+        The result is cached per edit serial. Tk sets its modified flag as soon as the text
+        changes, before <<Modified>> bumps the serial, so a set flag also means recount.
+
+        :return: Number of whitespace-separated words.
+        """
+        if self._word_count_serial == self._edit_serial and not self.text.edit_modified():
+            return self._word_count
+        line_count = int(self.text.index('end-1c').split('.')[0])
+        words = 0
+        for first in range(1, line_count + 1, WORD_COUNT_BLOCK_LINES):
+            words += len(self.text.get(f"{first}.0", f"{first + WORD_COUNT_BLOCK_LINES}.0").split())
+        self._word_count, self._word_count_serial = words, self._edit_serial
+        return words
+
+    def has_unsaved_edits(self) -> bool:
+        """
+        Check whether the text has been edited since the last save.
+        """
+        return self._edit_serial != self._last_saved_serial
 
     def delayed_update_line_numbers(self, event=None) -> None:
         """
-        Schedule an update for line numbers with a delay to prevent excessive updates.
+        Schedule an update for line numbers once Tk is idle to prevent excessive updates.
 
-        This method ensures that line numbers are only updated after a brief period of inactivity,
-        reducing CPU usage during active typing.
+        Several edits handled in the same event-loop pass share a single update.
 
-        :param event: Optional event object, typically from a key press or text modification.
+        :param event: Optional event object, typically from a text modification.
         """
         # Only schedule an update if one isn't already scheduled
         if not self.update_line_number_scheduled:
             self.update_line_number_scheduled = True
-            # Use `self.master.after` to delay the update
-            self.master.after(self.update_line_number_delay, self.update_line_numbers)
+            self.master.after_idle(self.update_line_numbers)
 
     def update_line_numbers(self):
         """
         Refresh the line numbers in the line number bar to reflect changes in the text area.
 
         This method:
-        - Clears the existing line numbers,
-        - Counts the new number of lines,
-        - Inserts fresh line numbers,
+        - Reads the line count from the text widget's end index,
+        - Appends or trims only the line numbers that changed since the last refresh,
         - Updates the indentation visualization,
         - Resynchronizes the scroll position of the line number bar with the text area.
         """
-        # Enable editing on the line number bar
-        self.line_number_bar.config(state='normal')
-        
-        # Clear all existing line numbers
-        self.line_number_bar.delete('1.0', tk.END)
-        
-        # Get the entire content of the text widget, stripping any trailing newlines
-        content = self.text.get("1.0", tk.END).strip()
-        
-        # Count lines, ensuring at least one line even if the content is empty
-        line_count = content.count('\n') + 1 if content else 1
-        
-        # Insert new line numbers
-        for i in range(1, line_count + 1):
-            self.line_number_bar.insert(tk.END, f"{i}\n")
-        
-        # Disable editing on the line number bar to prevent user input
-        self.line_number_bar.config(state='disabled')
-        
+        # The line of the last character is the line count; no need to copy the buffer
+        line_count = int(self.text.index('end-1c').split('.')[0])
+        rendered = self._rendered_line_count
+        bar = str(self.line_number_bar)
+
+        # Build every line number bar change into one Tcl script so it costs a single round-trip
+        script = []
+        if line_count != rendered:
+            # Enable editing on the line number bar
+            script.append(f"{bar} configure -state normal")
+
+            if line_count > rendered:
+                # Append the missing numbers; they are only digits and newlines, so bracing is safe
+                numbers = _line_numbers_text(rendered + 1, line_count)
+                script.append(f"{bar} insert end {{{numbers}}}")
+            else:
+                # Drop the numbers past the new last line; stopping at end-1c keeps the last
+                # kept number's newline, which a delete running to end would take with it
+                script.append(f"{bar} delete {line_count + 1}.0 end-1c")
+
+            # Disable editing on the line number bar to prevent user input
+            script.append(f"{bar} configure -state disabled")
+            self._rendered_line_count = line_count
+
+        # Synchronize the scroll position
+        script.append(f"{bar} yview moveto {self.text.yview()[0]}")
+        self.master.tk.eval("\n".join(script))
+
         # Reset the scheduling flag
         self.update_line_number_scheduled = False
-        
-        # Synchronize the scroll position
-        self.line_number_bar.yview_moveto(self.text.yview()[0])
 
         # Update indentation visualization
         self.update_indentation()
@@ -597,52 +1020,90 @@ class TextEditor:
         """
         # Initialize the main menu bar
         menu_bar = Menu(self.master)
-
-        # File menu
-        file_menu = Menu(menu_bar, tearoff=0, background=self.current_theme["menu_background"], foreground="#FFFFFF")
-        # Note: Changed 'fg' to 'foreground' for consistency with Tkinter's API
-        file_menu.add_command(label='Open', command=self.open_file)
-        file_menu.add_command(label='Save', command=lambda: self.save_and_update_status())
-        file_menu.add_command(label='Close', command=self.close_file)
-        # Customize menu
-        file_menu.add_command(label="Customize Theme", command=self.open_customize_dialog)
-        file_menu.add_command(label="About", command=self.open_about_dialog)
-        menu_bar.add_cascade(label='File', menu=file_menu)
-
-        # Edit menu
-        edit_menu = Menu(menu_bar, tearoff=0, background=self.current_theme["menu_background"], foreground="#FFFFFF")
-        edit_menu.add_command(label="Undo | Ctrl+Z", command=self.custom_undo)
-        edit_menu.add_command(label="Redo | Ctrl+Y", command=self.custom_redo)
-        edit_menu.add_command(label="Find and Replace", command=self.open_find_replace_dialog)
-        edit_menu.add_command(label="Clear Undo/Redo", command=self.clear_undo_redo)  # Add this
-        menu_bar.add_cascade(label='Edit', menu=edit_menu)
-
-        # Format menu
-        format_menu = Menu(menu_bar, tearoff=0, background=self.current_theme["menu_background"], foreground="#FFFFFF")
-        format_menu.add_command(label='Font Size', command=self.change_font_size)
-        format_menu.add_command(label='Change Font', command=self.change_font)
-        format_menu.add_command(label='Font Color', command=self.change_font_color)
-        format_menu.add_command(label='Bold | Ctrl+b', command=self.toggle_bold)  # Corrected keyboard shortcut in label
-        format_menu.add_command(label='Italic | Ctrl+i', command=self.toggle_italic)  # Corrected keyboard shortcut in label
-        format_menu.add_command(label='Underline | Ctrl+u', command=self.toggle_underline)  # Corrected keyboard shortcut in label
-        menu_bar.add_cascade(label='Format', menu=format_menu)
-
-        # View menu - Line Numbers
-        view_menu_line_numbers = Menu(menu_bar, tearoff=0, background=self.current_theme["menu_background"], foreground="#FFFFFF")
-        view_menu_line_numbers.add_command(label="Toggle Line Numbers", command=self.toggle_line_numbers)
-        menu_bar.add_cascade(label='View', menu=view_menu_line_numbers)
-
-        # Calendar menu
-        calendar_menu = Menu(menu_bar, tearoff=0, background=self.current_theme["menu_background"], foreground="#FFFFFF")
-        calendar_menu.add_command(label="Open Calendar", command=lambda: open_calendar(self.master, self.text, self.current_theme))
-        #calendar_menu.add_command(label="Select Date", command=self.open_calendar)  # New button to just open the calendar
-        menu_bar.add_cascade(label='Calendar', menu=calendar_menu)
+        # Every submenu shares the same styling
+        menu_kwargs = {"tearoff": 0, "background": self.current_theme["menu_background"], "foreground": "#FFFFFF"}
+
+        # Submenu entries as (label, command); each submenu is filled the first time it is posted
+        cascades = (
+            # File menu
+            ('File', (
+                ('Open', self.open_file),
+                ('Save', lambda: self.save_and_update_status()),
+                ('Close', self.close_file),
+                # Customize menu
+                ("Customize Theme", self.open_customize_dialog),
+                ("About", self.open_about_dialog),
+            )),
+            # Edit menu
+            ('Edit', (
+                ("Undo | Ctrl+Z", self.custom_undo),
+                ("Redo | Ctrl+Y", self.custom_redo),
+                ("Find and Replace", self.open_find_replace_dialog),
+                ("Clear Undo/Redo", self.clear_undo_redo),
+            )),
+            # Format menu
+            ('Format', (
+                ('Font Size', self.change_font_size),
+                ('Change Font', self.change_font),
+                ('Font Color', self.change_font_color),
+                ('Bold | Ctrl+b', self.toggle_bold),
+                ('Italic | Ctrl+i', self.toggle_italic),
+                ('Underline | Ctrl+u', self.toggle_underline),
+            )),
+            # View menu - Line Numbers
+            ('View', (
+                ("Toggle Line Numbers", self.toggle_line_numbers),
+            )),
+            # Calendar menu
+            ('Calendar', (
+                ("Open Calendar", lambda: open_calendar(self.master, self.text, self.current_theme)),
+            )),
+        )
+        for label, entries in cascades:
+            self._add_lazy_cascade(menu_bar, label, entries, menu_kwargs)
 
         # Bind the close window event to the close_file method
         self.master.protocol("WM_DELETE_WINDOW", self.close_file)
         
         # Set the menu bar to the main window
         self.master.config(menu=menu_bar)
+        self.menu_bar = menu_bar  # cget('menu') only returns the widget's path name
+
+    def _add_lazy_cascade(self, menu_bar: Menu, label: str, entries, menu_kwargs: Dict[str, Any]) -> Menu:
+        """
+        Add a cascade whose commands are only created when it is first posted.
+
+        :param menu_bar: The menu bar to add the cascade to.
+        :param label: The cascade label.
+        :param entries: Sequence of (label, command) pairs for the submenu.
+        :param menu_kwargs: Styling options for the submenu.
+        :return: The (initially empty) submenu.
+        """
+        submenu = Menu(menu_bar, **menu_kwargs)
+
+        def populate():
+            submenu.configure(postcommand="")  # Only fill the menu once
+            for entry_label, command in entries:
+                submenu.add_command(label=entry_label, command=command)
+
+        submenu.configure(postcommand=populate)
+        menu_bar.add_cascade(label=label, menu=submenu)
+        return submenu
+
+    def _center_dialog(self, dialog: Toplevel, width: int, height: int) -> None:
+        """
+        Size a dialog and center it on the main window.
+
+        The main window's position and size are fetched in a single Tcl call.
+
+        :param dialog: The dialog to place.
+        :param width: Dialog width in pixels.
+        :param height: Dialog height in pixels.
+        """
+        path = str(self.master)
+        x, y, main_width, main_height = map(int, self.master.tk.splitlist(self.master.tk.eval(
+            f"list [winfo x {path}] [winfo y {path}] [winfo width {path}] [winfo height {path}]")))
+        dialog.geometry(f"{width}x{height}+{x + (main_width - width) // 2}+{y + (main_height - height) // 2}")
 
     def open_customize_dialog(self):
         """
@@ -657,19 +1118,8 @@ class TextEditor:
         dialog = Toplevel(self.master)
         dialog.title("Select Theme")
         
-        main_window_x = self.master.winfo_x()
-        main_window_y = self.master.winfo_y()
-        main_window_width = self.master.winfo_width()
-        main_window_height = self.master.winfo_height()
-
-        dialog_width = 300  # Width of the dialog, adjust as necessary
-        dialog_height = 100  # Height of the dialog, adjust as necessary
-
-        # Center dialog relative to main window
-        center_x = main_window_x + (main_window_width // 2) - (dialog_width // 2)
-        center_y = main_window_y + (main_window_height // 2) - (dialog_height // 2)
-
-        dialog.geometry(f"{dialog_width}x{dialog_height}+{center_x}+{center_y}")
+        # Center dialog relative to main window; size adjustable as necessary
+        self._center_dialog(dialog, 300, 100)
 
         # Apply the current theme background color to the window
         dialog.configure(bg=self.current_theme["background"])
@@ -691,19 +1141,8 @@ class TextEditor:
         dialog = Toplevel(self.master)
         dialog.title("About Simple Note")
         
-        main_window_x = self.master.winfo_x()
-        main_window_y = self.master.winfo_y()
-        main_window_width = self.master.winfo_width()
-        main_window_height = self.master.winfo_height()
-
-        dialog_width = 300  # Width of the dialog, adjust as necessary
-        dialog_height = 200  # Height of the dialog, adjust as necessary
-
-        # Center dialog relative to main window
-        center_x = main_window_x + (main_window_width // 2) - (dialog_width // 2)
-        center_y = main_window_y + (main_window_height // 2) - (dialog_height // 2)
-
-        dialog.geometry(f"{dialog_width}x{dialog_height}+{center_x}+{center_y}")
+        # Center dialog relative to main window; size adjustable as necessary
+        self._center_dialog(dialog, 300, 200)
 
         # Apply the current theme background color to the window
         dialog.configure(bg=self.current_theme["background"])
@@ -734,89 +1173,103 @@ class TextEditor:
             # Store the new theme for future reference
             self.current_theme = theme
 
+            # Resolve the colors used by several widgets once
+            background = theme["background"]
+            text_color = theme["text"]
+            indent_guide = theme.get('indent_guide', background)
+
             # Apply theme to main window components
-            self.master.configure(bg=theme["background"])  # Main window
-            self.text_frame.configure(bg=theme["background"])  # Text editor frame
+            configure_if_changed(self.master, bg=background)  # Main window
+            configure_if_changed(self.text_frame, bg=background)  # Text editor frame
 
-            # Update text widgets
-            self.text.configure(bg=theme["background"], fg=theme["text"])
-            self.line_number_bar.configure(bg=theme["background"], fg=theme.get("line_numbers", theme["text"]))
-            self.status_bar.configure(bg=theme["background"], fg=theme.get("status_text", theme["text"]))
+            # Update text widgets; the theme's text color becomes the font color
+            self.font_color = text_color
+            configure_if_changed(self.text, bg=background, fg=text_color)
+            configure_if_changed(self.line_number_bar, bg=background, fg=theme.get("line_numbers", text_color))
+            self.status_bar.configure(bg=background, fg=theme.get("status_text", text_color))
 
             # Update scrollbar style
-            self.style.configure("Vertical.TScrollbar", 
-                                background=theme.get("scrollbar_background", "#D3D3D3"),
-                                troughcolor=theme.get("scrollbar_trough", "#FFFFFF"),
-                                bordercolor=theme.get("scrollbar_border", "#A9A9A9"),
-                                arrowcolor=theme.get("scrollbar_arrow", "#000000"))
+            self._configure_scrollbar_style(theme)
 
             # Update menu bar colors
-            menu_bar = self.master.cget('menu')  # This should return the Menu object
-            if isinstance(menu_bar, Menu):  # Check if it's actually a Menu object
-                menu_bar.configure(
-                    background=theme.get("menu_background", theme["background"]),
-                    foreground=theme.get("menu_foreground", theme["text"]),
-                    activebackground=theme.get("menu_active_background", theme["background"]),
-                    activeforeground=theme.get("menu_active_foreground", theme["text"]),
-                    disabledforeground=theme.get("menu_disabled_foreground", "#A3A3A3")
+            menu_bar = getattr(self, 'menu_bar', None)
+            if menu_bar is not None:
+                # Resolve the menu colors once for the bar and all its submenus
+                menu_options = {
+                    "background": theme.get("menu_background", background),
+                    "foreground": theme.get("menu_foreground", text_color),
+                    "activebackground": theme.get("menu_active_background", background),
+                    "activeforeground": theme.get("menu_active_foreground", text_color),
+                    "disabledforeground": theme.get("menu_disabled_foreground", "#A3A3A3"),
+                }
+                configure_if_changed(menu_bar, **menu_options)
+                # Configure every submenu inside one Tcl script instead of one call per menu
+                options = " ".join(f"-{name} {{{value}}}" for name, value in menu_options.items())
+                self.master.tk.eval(
+                    f"foreach m [winfo children {menu_bar}] {{"
+                    f" if {{[winfo class $m] eq \"Menu\"}} {{ $m configure {options} }} }}"
                 )
-                for menu in menu_bar.winfo_children():
-                    if isinstance(menu, Menu):
-                        menu.configure(
-                            background=theme.get("menu_background", theme["background"]),
-                            foreground=theme.get("menu_foreground", theme["text"]),
-                            activebackground=theme.get("menu_active_background", theme["background"]),
-                            activeforeground=theme.get("menu_active_foreground", theme["text"]),
-                            disabledforeground=theme.get("menu_disabled_foreground", "#A3A3A3")
-                        )
-            else:
-                print("Menu bar not found or not a Menu object")
 
             # Update calendar window if it's currently open
             if hasattr(self, 'calendar_window') and self.calendar_window:
                 if self.calendar_window.winfo_exists():
-                    self.calendar_window.configure(bg=theme["background"])
+                    self.calendar_window.configure(bg=background)
                     if hasattr(self, 'cal'):
-                        self.cal.config(background=theme["background"], foreground=theme["text"])
+                        self.cal.config(background=background, foreground=text_color)
 
             # Update dialogs and windows if open
-            if hasattr(self, 'find_replace_open') and self.find_replace_open:
-                for child in self.master.winfo_children():
-                    if isinstance(child, Toplevel) and child.title() == "Find and Replace":
-                        self._update_dialog_theme(child, theme)
-                        break
-
-            # Set the font color based on the theme
-            self.font_color = theme.get("text", self.font_color)
-            self.text.configure(fg=self.font_color)
+            if self._find_replace_window is not None:
+                self._update_dialog_theme(self._find_replace_window, self._find_replace_widgets, theme)
 
             # Refresh text styling tags to reflect the new theme
             self.update_font()
 
             # Configure indentation visualization
-            self.text.tag_configure('indent', tabs=('0.5c',), background=theme.get('indent_guide', theme['background']))
-            self.text.tag_configure('dedent', background=theme.get('indent_guide', theme['background']))
+            self.text.tag_configure('indent', tabs=('0.5c',), background=indent_guide)
+            self.text.tag_configure('dedent', background=indent_guide)
 
     def set_theme(self, theme: Dict[str, str]) -> None:
         """
-        Apply a new theme to the application. This method is identical to apply_theme 
-        for consistency in terminology but can be used for dynamic theme changes.
+        Apply a new theme to the application. All theming goes through apply_theme;
+        this name is kept for the menu and startup callers.
         """
         self.apply_theme(theme)
 
-    def _update_dialog_theme(self, dialog: Toplevel, theme: Dict[str, str]) -> None:
+    def _configure_scrollbar_style(self, theme: Dict[str, str]) -> None:
         """
-        Recursively update the theme of a dialog and all its children widgets.
+        Give the Vertical.TScrollbar style the theme's scrollbar colors.
+
+        Configuring a ttk style redraws every widget using it, so the style is left alone
+        when the colors are the ones already applied.
+
+        :param theme: The theme dictionary to take the colors from.
+        """
+        colors = (theme.get("scrollbar_background", "#D3D3D3"),
+                  theme.get("scrollbar_trough", "#FFFFFF"),
+                  theme.get("scrollbar_border", "#A9A9A9"),
+                  theme.get("scrollbar_arrow", "#000000"))
+        if colors == self._scrollbar_style:
+            return
+        self._scrollbar_style = colors
+        background, trough, border, arrow = colors
+        self.style.configure("Vertical.TScrollbar", background=background, troughcolor=trough,
+                             bordercolor=border, arrowcolor=arrow)
+
+    def _update_dialog_theme(self, dialog: Toplevel, widgets: List[tk.Widget], theme: Dict[str, str]) -> None:
+        """
+        Update the theme of a dialog and the widgets recorded when it was built.
+
+        The dialog's widget set is fixed, so the recorded list is configured directly instead
+        of walking the widget tree; configure_if_changed skips widgets that already match.
 
         :param dialog: The top-level dialog window to update.
+        :param widgets: The widgets of the dialog to restyle.
         :param theme: The theme dictionary to apply.
         """
-        dialog.configure(bg=theme["background"])
-        for widget in dialog.winfo_children():
-            if isinstance(widget, (Label, Entry, Button)):
-                widget.configure(bg=theme["background"], fg=theme["text"])
-            elif isinstance(widget, Text):
-                widget.configure(bg=theme["background"], fg=theme["text"])
+        configure_if_changed(dialog, bg=theme["background"])
+        options = {"bg": theme["background"], "fg": theme["text"]}
+        for widget in widgets:
+            configure_if_changed(widget, **options)
 
     def set_system_theme(self):
         """
@@ -840,11 +1293,9 @@ class TextEditor:
 
         This method:
         - Checks if the dialog is already open to avoid multiple instances,
-        - Creates a new top-level window for find/replace operations,
+        - Builds the dialog on first use and re-shows the hidden one afterwards,
         - Centers the dialog on the screen,
-        - Applies the current theme,
-        - Sets up UI elements for finding and replacing text,
-        - Binds window close events and keyboard shortcuts.
+        - Makes it modal and focuses the search field.
         """
         # Prevent opening multiple find/replace windows
         if getattr(self, 'find_replace_open', False):
@@ -853,11 +1304,10 @@ class TextEditor:
         # Flag to indicate that find/replace dialog is open
         self.find_replace_open = True
 
-        # Create the find/replace dialog window
-        find_replace_window = Toplevel(self.master)
-        find_replace_window.title("Find and Replace")
-        # Set the background color according to the current theme
-        find_replace_window.configure(bg=self.current_theme["background"])
+        find_replace_window = self._find_replace_window
+        reuse = find_replace_window is not None and find_replace_window.winfo_exists()
+        if not reuse:
+            find_replace_window = self._build_find_replace_dialog()
 
         # Calculate dialog position to center it on screen
         screen_width = self.master.winfo_screenwidth()
@@ -867,17 +1317,43 @@ class TextEditor:
         y = (screen_height // 2) - (dialog_height // 2)
         find_replace_window.geometry(f"{dialog_width}x{dialog_height}+{x}+{y}")
 
+        if reuse:
+            # Hidden by a previous close; theme changes were applied to it while hidden
+            find_replace_window.deiconify()
+
         # Make this dialog modal
         find_replace_window.grab_set()
         # Focus on this window to ensure user interaction starts here
         find_replace_window.focus_force()
+        # Set focus here for immediate typing; a previous search is selected so typing replaces it
+        self._find_entry.focus_set()
+        self._find_entry.select_range(0, tk.END)
+
+    def _build_find_replace_dialog(self) -> Toplevel:
+        """
+        Create the find/replace dialog and its widgets, which are kept for later opens.
+
+        This method:
+        - Creates a new top-level window for find/replace operations,
+        - Applies the current theme,
+        - Sets up UI elements for finding and replacing text,
+        - Binds window close events and keyboard shortcuts.
+
+        :return: The dialog window.
+        """
+        # Create the find/replace dialog window
+        find_replace_window = Toplevel(self.master)
+        find_replace_window.title("Find and Replace")
+        self._find_replace_window = find_replace_window
+        # Set the background color according to the current theme
+        find_replace_window.configure(bg=self.current_theme["background"])
 
         # Find text label and entry
         find_label = Label(find_replace_window, text="Find:", bg=self.current_theme["background"], fg=self.current_theme["text"])
         find_label.pack(pady=5)
         find_entry = Entry(find_replace_window)
         find_entry.pack(pady=5)
-        find_entry.focus_set()  # Set focus here for immediate typing
+        self._find_entry = find_entry
 
         # Replace with label and entry
         replace_label = Label(find_replace_window, text="Replace with:", bg=self.current_theme["background"], fg=self.current_theme["text"])
@@ -901,20 +1377,25 @@ class TextEditor:
                             fg=self.current_theme["button_foreground"])
         close_button.pack(pady=5)
 
+        # Widgets restyled by apply_theme
+        self._find_replace_widgets = [find_label, find_entry, replace_label, replace_entry, replace_button, close_button]
+
         # Bind ESC key to close the dialog
         find_replace_window.bind("<Escape>", lambda event: self.close_find_replace_dialog(find_replace_window))
         # Bind the window close event (X button) to our close method
         find_replace_window.protocol("WM_DELETE_WINDOW", lambda: self.close_find_replace_dialog(find_replace_window))
+        return find_replace_window
 
     def close_find_replace_dialog(self, dialog):
         """
         Close the find/replace dialog window.
 
         This method:
-        - Destroys the dialog window,
+        - Releases the modal grab and hides the dialog, keeping its widgets for the next open,
         - Updates the open state flag to indicate the dialog is closed.
         """
-        dialog.destroy()  # Remove the dialog from the screen
+        dialog.grab_release()
+        dialog.withdraw()  # Remove the dialog from the screen
         self.find_replace_open = False  # Mark the dialog as closed
 
     def replace_text(self, search_text: str, replace_text: str) -> None:
@@ -922,36 +1403,38 @@ class TextEditor:
         Replace all occurrences of `search_text` with `replace_text` in the text widget.
 
         This method:
-        - Searches for the `search_text` from the beginning of the text.
-        - Replaces each occurrence with `replace_text`.
-        - Continues until no more matches are found.
+        - Reads the buffer once and finds every match with `re.finditer`,
+        - Converts each match's character offsets to "line.column" indices, counting
+          columns in Tk's units so characters outside the BMP do not shift them,
+        - Replaces the matches last to first, so earlier indices stay valid and text
+          and formatting tags between matches are left untouched.
 
         :param search_text: The text to find in the editor.
         :param replace_text: The text to replace with.
         """
-        self.save_undo_state()
-
         if not search_text:
             messagebox.showinfo("Info", "Please enter a search term.")
             return
 
-        start_pos = '1.0'  # Starting position for search
-        while True:
-            # Search for the text from the current position to the end
-            start_pos = self.text.search(search_text, start_pos, stopindex=tk.END)
-            if not start_pos:  # If no match was found, break out of the loop
-                break
-            
-            # Calculate the end position of the found text
-            end_pos = f"{start_pos}+{len(search_text)}c"
-            
-            # Delete the found text
-            self.text.delete(start_pos, end_pos)
-            # Insert the replacement text at the same position
-            self.text.insert(start_pos, replace_text)
-            
-            # Update the start position for the next search to continue from where we left off
-            start_pos = f"{start_pos}+{len(replace_text)}c"
+        content = self.text.get('1.0', 'end-1c')
+        spans = [match.span() for match in re.finditer(re.escape(search_text), content)]
+        if not spans:
+            return
+
+        self.save_undo_state()
+
+        # Offset of the first character of every line, for offset -> "line.column"
+        line_starts = [0]
+        line_starts.extend(match.end() for match in re.finditer('\n', content))
+
+        def index(offset: int) -> str:
+            line = bisect.bisect_right(line_starts, offset)
+            return f"{line}.{self._tk_length(content, line_starts[line - 1], offset)}"
+
+        self.text.edit_separator()
+        for match_start, match_end in reversed(spans):
+            self.text.replace(index(match_start), index(match_end), replace_text)
+        self.text.edit_separator()
 
     def toggle_bold(self):
         """
@@ -963,7 +1446,6 @@ class TextEditor:
         """
         Toggle the italic text style for the selected or current insertion point.
         """
-        print("toggle_italic called")
         self.toggle_style("italic")
         return "break"  # Prevent further event propagation
 
@@ -976,8 +1458,23 @@ class TextEditor:
     def refocus_text(self) -> None:
         """Ensure focus is on the text widget after configuration changes."""
         self.text.focus_set()
-        # Call this when necessary, e.g., after theme change or window resize
-        self.master.bind("<Configure>", lambda e: self.refocus_text())
+
+    def _on_configure(self, event) -> None:
+        """
+        Refocus the text widget once the main window has finished resizing.
+
+        A drag-resize sends a burst of <Configure> events; they share one idle refocus.
+        Events from child widgets, which also reach the toplevel's binding, are ignored.
+        """
+        if event.widget is not self.master or self._refocus_scheduled:
+            return
+        self._refocus_scheduled = True
+
+        def refocus() -> None:
+            self._refocus_scheduled = False
+            self.refocus_text()
+
+        self.master.after_idle(refocus)
 
     def toggle_style(self, style: str):
         """
@@ -985,7 +1482,7 @@ class TextEditor:
 
         :param style: The style to toggle ("bold", "italic", or "underline").
         """
-        print(f"toggle_style called with {style}")  # Debug print
+        logging.debug("toggle_style called with %s", style)
         self.save_undo_state()
         
         try:
@@ -996,54 +1493,118 @@ class TextEditor:
             start = end = insert
 
         current_tags = self.text.tag_names(start)
-        print(f"Current tags at start: {self.text.tag_names(start)}")  # Debug print before toggling
         if style in current_tags:
             self.text.tag_remove(style, start, end)
-            print(f"Tag {style} removed at range: {start} to {end}")  # Debug print
+            logging.debug("Tag %s removed at range: %s to %s", style, start, end)
         else:
             self.text.tag_add(style, start, end)
-            print(f"Tag {style} added at range: {start} to {end}")  # Debug print
-        print(f"Current tags after operation: {self.text.tag_names(start)}")  # Debug print after toggling
+            logging.debug("Tag %s added at range: %s to %s", style, start, end)
+
+        # Update the font for the range to ensure correct rendering of combined styles; toggles
+        # made before the event loop goes idle share one update and one redraw
+        self._schedule_style_refresh(start, end)
 
-        # Update the font for the range to ensure correct rendering of combined styles
-        self.update_font_for_range(start, end)
-        self.text.update_idletasks()  # Force an update of the widget
+    def _schedule_style_refresh(self, start: str, end: str) -> None:
+        """
+        Add a range to the pending style refresh and schedule the refresh if it isn't already.
+
+        :param start: Starting index of the range.
+        :param end: Ending index of the range.
+        """
+        pending = self._style_refresh_range
+        if pending is not None:
+            if self.text.compare(pending[0], '<', start):
+                start = pending[0]
+            if self.text.compare(pending[1], '>', end):
+                end = pending[1]
+        self._style_refresh_range = (start, end)
+        if not self._style_refresh_scheduled:
+            self._style_refresh_scheduled = True
+            self.master.after_idle(self._flush_style_refresh)
+
+    def _flush_style_refresh(self) -> None:
+        """
+        Run update_font_for_range once over every range toggled since the refresh was scheduled.
+        """
+        self._style_refresh_scheduled = False
+        pending, self._style_refresh_range = self._style_refresh_range, None
+        if pending is not None:
+            self.update_font_for_range(*pending)
 
     def update_font_for_range(self, start: str, end: str) -> None:
         """
         Update the font for a given range in the text widget to reflect current tags.
 
-        This method ensures that the "combined" tag is both added when styles are present 
-        and removed when no longer needed.
+        The range is split wherever a bold, italic or underline tag starts or ends; each
+        piece then gets the precomputed "style_<mask>" tag for its combination of styles,
+        so no fonts are created here.
 
         :param start: Starting index of the range.
         :param end: Ending index of the range.
         """
-        print(f"Updating font for range {start} to {end}")  # Debug print
-        base_font = tkFont.Font(family=self.font_family, size=self.font_size)
+        logging.debug("Updating font for range %s to %s", start, end)
+        if start == end:
+            return
         try:
-            for index in self.text.tag_ranges("sel"):
-                font = base_font.copy()
-                tags = self.text.tag_names(index)
-                has_style = False
-
-                if "bold" in tags:
-                    font.configure(weight="bold")
-                    has_style = True
-                if "italic" in tags:
-                    font.configure(slant="italic")
-                    has_style = True
-                if "underline" in tags:
-                    font.configure(underline=True)
-                    has_style = True
-                if has_style:
-                    self.text.tag_configure("combined", font=font)
-                    self.text.tag_add("combined", index, self.text.index(f"{index}+1c"))
-                else:
-                    # Remove the "combined" tag if no style is applied
-                    self.text.tag_remove("combined", index, self.text.index(f"{index}+1c"))
+            def position(index) -> Tuple[int, int]:
+                line, column = str(index).split('.')
+                return int(line), int(column)
+
+            first, last = position(start), position(end)
+            # Every point inside the range where the set of style tags may change, and each
+            # style tag's ranges so piece membership is decided here rather than asked of Tk
+            bounds = {first, last}
+            tag_spans: List[List[Tuple[Tuple[int, int], Tuple[int, int]]]] = []
+            for tag in STYLE_TAGS:
+                indices = [position(index) for index in self.text.tag_ranges(tag)]
+                spans = list(zip(indices[::2], indices[1::2]))
+                tag_spans.append(spans)
+                bounds.update(pos for pos in indices if first < pos < last)
+            bounds = sorted(bounds)
+
+            def has_tag(spans, pos) -> bool:
+                # Tag ranges are sorted and disjoint; find the last one starting at or before pos
+                i = bisect.bisect_right(spans, (pos, (float('inf'), 0))) - 1
+                return i >= 0 and spans[i][0] <= pos < spans[i][1]
+
+            # Group the pieces by style combination so each tag is added in one command
+            ranges_by_mask: Dict[int, List[str]] = {}
+            for piece_start, piece_end in zip(bounds, bounds[1:]):
+                mask = sum(1 << bit for bit, spans in enumerate(tag_spans) if has_tag(spans, piece_start))
+                if mask:
+                    ranges_by_mask.setdefault(mask, []).extend(("%d.%d" % piece_start, "%d.%d" % piece_end))
+
+            # Clear and re-add the combined-style tags in a single Tcl round-trip; indices are
+            # plain "line.column" strings and tag names are fixed, so no quoting is needed
+            widget = str(self.text)
+            span = "%d.%d %d.%d" % (first + last)
+            script = [f"{widget} tag remove style_{mask} {span}" for mask in range(1, 1 << len(STYLE_TAGS))]
+            script.extend(f"{widget} tag add style_{mask} {' '.join(ranges)}" for mask, ranges in ranges_by_mask.items())
+            self.text.tk.eval("\n".join(script))
         except Exception as e:
-            print(f"Error updating font for range: {e}")
+            logging.error("Error updating font for range: %s", e)
+
+    def _configure_fonts(self) -> None:
+        """
+        Give the text widget and its style tags the fonts for the current family and size.
+
+        Besides the base font and the "normal", "bold", "italic" and "underline" tags, one
+        "style_<mask>" tag is configured per combination of styles, where bit i of the mask
+        stands for STYLE_TAGS[i]. The combined tags are raised above every other tag so their
+        fonts win over the single-style tags without any reordering when styles are toggled.
+
+        Everything is sent to Tk as one script rather than one call per tag.
+        """
+        family, size = self.font_family, self.font_size
+        widget = str(self.text)
+        base = _style_font(family, size, 0)
+        commands = [f"{widget} configure -font {base}", f"{widget} tag configure normal -font {base}"]
+        for bit, tag in enumerate(STYLE_TAGS):
+            commands.append(f"{widget} tag configure {tag} -font {_style_font(family, size, 1 << bit)}")
+        for mask in range(1, 1 << len(STYLE_TAGS)):
+            commands.append(f"{widget} tag configure style_{mask} -font {_style_font(family, size, mask)}")
+            commands.append(f"{widget} tag raise style_{mask}")
+        self.text.tk.eval("\n".join(commands))
 
     def change_font_size(self):
         """
@@ -1062,9 +1623,11 @@ class TextEditor:
 
         This method presents a dialog to choose from available font families and updates the font if a valid choice is made.
         """
-        fonts = tkFont.families()  # Get list of available font families
         font_choice = simpledialog.askstring("Font", "Choose a font:", initialvalue=self.font_family)
-        if font_choice in fonts:
+        if font_choice and font_choice not in _font_families():
+            # Rescan once in case the font was installed after the list was cached
+            _font_families.cache_clear()
+        if font_choice in _font_families():
             self.font_family = font_choice
             self.update_font()
 
@@ -1072,71 +1635,47 @@ class TextEditor:
         """
         Allow the user to change the font color in the editor.
 
-        This method prompts for a hex color code and applies it if the input is valid.
+        This method opens Tk's color picker on the current font color, so the choice is parsed
+        and validated by Tk and a cancelled picker leaves the color unchanged.
         """
-        color = simpledialog.askstring("Font Color", "Enter color in hex (e.g., #FF0000 for red):")
-        if color and color.startswith("#"):
+        _, color = askcolor(initialcolor=self.font_color, title="Font Color", parent=self.master)
+        if color:
             self.font_color = color
-            self.text.configure(fg=self.font_color)
+            self.text.configure(fg=color)
 
     def update_font(self):
         """Update the font settings for the text widget and style tags."""
-        font = tkFont.Font(family=self.font_family, size=self.font_size)
-        self.text.configure(font=font)
-        # Update each style tag with the new base font
-        for tag in ["bold", "italic", "underline", "combined"]:
-            tag_font = font.copy()
-            if tag == "bold":
-                tag_font.configure(weight="bold")
-            elif tag == "italic":
-                tag_font.configure(slant="italic")
-            elif tag == "underline":
-                tag_font.configure(underline=True)
-            # 'combined' tag uses base font; specifics handled elsewhere
-            self.text.tag_configure(tag, font=tag_font)
-        
-        # Update each tag configuration with the new font
-        for tag in ["bold", "italic", "underline"]:
-            tag_font = font.copy()
-            if tag == "bold":
-                tag_font.configure(weight="bold")
-            elif tag == "italic":
-                tag_font.configure(slant="italic")
-            elif tag == "underline":
-                tag_font.configure(underline=True)
-            self.text.tag_configure(tag, font=tag_font)
+        # Nothing to reconfigure if the family and size are the ones already applied
+        if (self.font_family, self.font_size) == self._applied_font:
+            return
+        self._applied_font = (self.font_family, self.font_size)
+        # The variants are shared through _get_font, so revisiting a size creates no fonts
+        self._configure_fonts()
 
     def update_indentation(self) -> None:
         """
         Visualize indentation in the text widget by adding or removing 'indent' tags.
 
-        This method iterates through each line to:
-        - Calculate the indentation level,
-        - Apply the 'indent' tag for spaces at the beginning of lines with indentation,
-        - Remove the 'indent' tag from lines with no or only whitespace indentation.
+        This method reads the buffer once and, in a single pass over its lines:
+        - Calculates the indentation level of each line,
+        - Collects the leading-whitespace range of every indented line,
+        then replaces the 'indent' tag with those ranges in two Tk calls.
 
         :return: None
         """
-        # Count total lines in the text widget
-        total_lines = self.text.count('1.0', tk.END, 'lines')[0] + 1  # +1 because count starts at 1
-        
-        for line_num in range(1, total_lines):
-            # Get the start and end index for the current line
-            line_start = f'{line_num}.0'
-            line_end = f'{line_num}.end'
-            
-            # Retrieve the text of the current line
-            line_text = self.text.get(line_start, line_end)
-            
+        content = self.text.get('1.0', 'end-1c')
+
+        ranges = []
+        for line_num, line_text in enumerate(content.split('\n'), start=1):
             # Calculate the indentation level by subtracting the length of the line with leading spaces removed
             indent_level = len(line_text) - len(line_text.lstrip())
-            
-            # If there's an indent, add the 'indent' tag to the spaces at the beginning of the line
             if indent_level > 0:
-                self.text.tag_add('indent', line_start, f'{line_num}.{indent_level}')
-            else:
-                # If there's no indent or it's just whitespace, remove the 'indent' tag
-                self.text.tag_remove('indent', line_start)
+                ranges.extend((f'{line_num}.0', f'{line_num}.{indent_level}'))
+
+        # Lines with no indent simply don't get the tag back
+        self.text.tag_remove('indent', '1.0', tk.END)
+        if ranges:
+            self.text.tag_add('indent', *ranges)
 
     def set_font_color_based_on_theme(self):
         """Adjust text color based on the current theme."""
@@ -1170,19 +1709,9 @@ class TextEditor:
             if not file_path:  # If no file was selected
                 return
 
-            # Open and read the file
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-            
-            # Clear existing text and insert new content
-            self.text.delete('1.0', 'end')
-            self.text.insert('1.0', content)
-            
-            # Update file tracking information
-            self.file_path = file_path
-            self.last_content = content
-            self.last_saved_time = time.time()
-            self.status_bar.update_status_bar()()
+            # Replace the current text with the file, read on a worker thread;
+            # _on_file_loaded updates the file tracking information once it is in
+            self._load_file_async(file_path)
         
         except PermissionError:
             messagebox.showerror("Error", "Permission denied. You do not have the rights to read this file.")
@@ -1198,94 +1727,217 @@ class TextEditor:
         :param event: Optional Tkinter event, typically bound to a key or menu action.
         """
         self.save()
-        self.status_bar.update_status_bar(self.file_path, len(self.text.get('1.0', 'end-1c').split()))
+        self.status_bar.update_status_bar(self.file_path, self.count_words())
 
-    def save(self, event=None):
+    def save(self, event=None, background: bool = True, autosave: bool = False):
         """
         Save the content of the text editor to a file.
 
         This method:
         - If no file path exists, prompts for one,
-        - Writes the current content to the file,
-        - Updates the application's state after saving.
+        - Hands the current content to a worker thread that writes it to the file,
+        - Updates the application's state from `_save_done` once the write finishes.
+
+        A save requested while another one is still writing runs again after it completes.
+        Autosaves never open a dialog: an untitled document is left alone, and the outcome
+        is reported in the status bar.
 
         :param event: Optional Tkinter event, typically bound to a key or menu action.
+        :param background: Write on a worker thread; False writes before returning, waiting for any save in flight.
+        :param autosave: The save was started by the autosave timer rather than by the user.
+        """
+        if self._loading_file:
+            # The widget holds part of the incoming file while file_path still names the old one
+            return
+
+        if not self.file_path:
+            if autosave:
+                return  # Asking for a file name is up to the user's own save
+            # If no file path is set, prompt the user to choose one
+            self.file_path = filedialog.asksaveasfilename(defaultextension=".txt", 
+                                                        filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
+            if not self.file_path:  # If no file path was chosen
+                return
+
+        if not self._save_lock.acquire(blocking=not background):
+            # The queued save stays quiet only if nothing but autosaves asked for it
+            self._save_requested_autosave = autosave and (self._save_requested_autosave or not self._save_requested)
+            self._save_requested = True
+            return
+
+        # This save covers every edit so far; the next edit schedules a fresh autosave
+        if self._autosave_after_id is not None:
+            self.master.after_cancel(self._autosave_after_id)
+            self._autosave_after_id = None
+
+        path = self.file_path
+        content = self.text.get('1.0', 'end-1c')
+        serial = self._edit_serial
+        if background:
+            self._start_worker(self._write_in_background, path, content, serial, autosave)
+        else:
+            # This write already has the latest text, so nothing queued behind it needs to run
+            self._save_requested = False
+            self._save_done(path, serial, autosave, *self._write_file(path, content))
+
+    def _write_file(self, path: str, content: str) -> Tuple[bytes, Optional[Exception]]:
         """
+        Write the content to a file and release the save lock. Safe to run off the Tk thread.
+
+        The text is encoded once and written straight to a sibling temporary file in
+        WRITE_CHUNK_BYTES slices, bypassing the text I/O layer. The temporary file is synced
+        and then moved over the original, so a crash or a full disk midway never leaves a
+        truncated document behind; on failure it is removed and the original is untouched.
+
+        :param path: The file to write.
+        :param content: The text to write.
+        :return: The content's digest and the exception raised while writing, if any.
+        """
+        tmp_path = None
         try:
-            if not self.file_path:
-                # If no file path is set, prompt the user to choose one
-                self.file_path = filedialog.asksaveasfilename(defaultextension=".txt", 
-                                                            filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
-                if not self.file_path:  # If no file path was chosen
-                    return
-
-            # Write the current content to the file
-            with open(self.file_path, 'w', encoding='utf-8') as file:
-                content = self.text.get('1.0', 'end-1c')
-                file.write(content)
-            
+            digest = _content_digest(content)
+            if os.linesep != '\n':
+                # Match the newline translation a text-mode write would have done
+                content = content.replace('\n', os.linesep)
+            data = memoryview(content.encode('utf-8'))
+            # Replace the file a symlink points to, not the link itself
+            target = os.path.realpath(path)
+            tmp_path = f"{target}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+            try:
+                written = 0
+                while written < len(data):
+                    written += os.write(fd, data[written:written + WRITE_CHUNK_BYTES])
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            if os.path.exists(target):
+                shutil.copymode(target, tmp_path)  # Keep the document's permissions
+            os.replace(tmp_path, target)
+            return digest, None
+        except Exception as e:
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass  # Never created, or already gone
+            return b"", e
+        finally:
+            self._save_lock.release()
+
+    def _write_in_background(self, path: str, content: str, serial: int, autosave: bool) -> None:
+        """
+        Worker thread body: write the file, then queue the result for `_save_done` on the Tk thread.
+        """
+        digest, error = self._write_file(path, content)
+        self._worker_results.put((self._save_done, (path, serial, autosave, digest, error)))
+
+    def _save_done(self, path: str, serial: int, autosave: bool, digest: bytes, error: Optional[Exception]) -> None:
+        """
+        Finish a save on the Tk thread: record the saved state or report why the write failed.
+
+        User saves report through message boxes; autosaves only through the status bar.
+
+        :param path: The file that was written.
+        :param serial: The edit serial of the text that was written.
+        :param autosave: The save was started by the autosave timer.
+        :param digest: The digest of the text that was written.
+        :param error: The exception raised while writing, or None on success.
+        """
+        message = None
+        try:
+            if error is not None:
+                raise error
+
             # Update last save information
             self.last_saved_time = time.time()
-            self.last_content = content
-            self.status_bar.update_status_bar(self.file_path, len(self.text.get('1.0', 'end-1c').split()))
-            messagebox.showinfo("Saved", f"File saved at {self.file_path}")
+            self._last_saved_digest = digest
+            self._last_saved_serial = serial
+            self.status_bar.update_status_bar(path, self.count_words())
+            if not autosave:
+                messagebox.showinfo("Saved", f"File saved at {path}")
 
             # Update autosave delay in config if changed
             self.config_manager.set("autosave_delay", self.autosave_delay)
 
-        except PermissionError as e:
-            messagebox.showerror("Error", "Permission denied. You do not have the rights to write to this file.")
-            logging.error(f"PermissionError while saving: {e}")
-        except FileNotFoundError as e:
-            messagebox.showerror("Error", "The file path specified does not exist.")
-            logging.error(f"The file path specified does not exist.: {e}")
+        except PermissionError:
+            message = "Permission denied. You do not have the rights to write to this file."
+        except FileNotFoundError:
+            message = "The file path specified does not exist."
         except OSError as e:
             # This includes IOError but also other OS-related errors
             if e.errno == 36:  # ENAMETOOLONG
-                messagebox.showerror("Error", "The file name is too long.")
+                message = "The file name is too long."
             elif e.errno == 28:  # ENOSPC
-                messagebox.showerror("Error", "No space left on device.")
+                message = "No space left on device."
             else:
-                messagebox.showerror("Error", f"An OS error occurred while saving the file: {e.strerror}")
+                message = f"An OS error occurred while saving the file: {e.strerror}"
         except UnicodeEncodeError:
-            messagebox.showerror("Error", "Encoding error while saving. Please check for invalid characters.")
+            message = "Encoding error while saving. Please check for invalid characters."
         except Exception as e:
             # Catch any other unexpected exceptions
-            messagebox.showerror("Error", f"An unexpected error occurred while saving the file: {str(e)}")
+            message = f"An unexpected error occurred while saving the file: {str(e)}"
+
+        if message is not None:
+            logging.error("%s (%r)", message, error)
+            if autosave:
+                self.status_bar.configure(text=f"Autosave failed: {message}")
+            else:
+                messagebox.showerror("Error", message)
+
+        if self._save_requested:
+            self._save_requested = False
+            self.save(autosave=self._save_requested_autosave)
 
     def check_for_changes(self) -> None:
         """
-        Periodically check for unsaved changes in the text editor and save if necessary.
+        Autosave the text editor if it has unsaved changes.
+
+        Runs `autosave_delay` ms after the first edit since the last save or check, as scheduled
+        by `on_text_modified`, so an idle editor has no timer running. The edit serial answers
+        "was anything typed since the last check?" without touching the buffer; only then is
+        the text read and compared by digest to what was last saved.
         """
-        print("Checking for changes")
-        current_content: str = self.text.get('1.0', tk.END)
-        if current_content != self.last_content:
-            print("Changes detected, saving")
-            self.save()
-            self.last_content = current_content
-        
-        # Schedule next check
-        print(f"Scheduling next check in {self.autosave_delay} ms")
-        self.master.after(self.autosave_delay, self.check_for_changes)
+        self._autosave_after_id = None
+        if self._loading_file:
+            # save() refuses to run mid-load; look again once the load had time to finish
+            self._autosave_after_id = self.master.after(self.autosave_delay, self.check_for_changes)
+            return
+        if self._edit_serial != self._last_autosave_serial:
+            self._last_autosave_serial = self._edit_serial
+            content = self.text.get('1.0', 'end-1c')
+            if _content_digest(content) != self._last_saved_digest:
+                logging.debug("Changes detected, saving")
+                self.save(autosave=True)
+            else:
+                # Edited back to the saved text
+                self._last_saved_serial = self._edit_serial
 
     def close_file(self) -> None:
         """
         Close the application, prompting to save if there are unsaved changes.
+
+        Only one question is asked: the save prompt when there are unsaved changes,
+        otherwise a plain quit confirmation.
         """
-        if self.text.edit_modified():
+        if self.has_unsaved_edits():
             choice = messagebox.askyesnocancel("Unsaved Changes", "You have unsaved changes. Do you want to save before quitting?")
             if choice is None:
                 return  # User cancelled, do not close
-            elif choice:
-                self.save()
-        
-        # Ask for confirmation to exit, regardless of saved state
-        if self.text.edit_modified() or messagebox.askokcancel("Quit", "Do you really want to quit?"):
-            self.master.destroy()
+            if choice:
+                # Write before returning, so the file is on disk before the window goes away
+                self.save(background=False)
+                if self.has_unsaved_edits():
+                    return  # The save failed or no file name was chosen; keep the window open
+        elif not messagebox.askokcancel("Quit", "Do you really want to quit?"):
+            return
+
+        self.config_manager.flush()
+        self.master.destroy()
 
 if __name__ == "__main__":
-    # Create the main window using TkinterDnD for drag and drop functionality
-    root = tkdnd.Tk()
+    # Create the main window using TkinterDnD for drag and drop functionality, if it is installed
+    root = tkdnd.Tk() if tkdnd is not None else tk.Tk()
     
     # Instantiate the TextEditor class with the root window
     app = TextEditor(root)
@@ -1,27 +1,47 @@
 # StatusBar.py
 
+import os
 import tkinter as tk
 import time
 from typing import Optional
 
 class StatusBar:
     def __init__(self, master):
-        self.status_bar = tk.Label(master, text="Ready", bd=0, relief=tk.FLAT, anchor=tk.W)
+        # The label shows text_var; setting it is the one channel for changing the status text
+        self.text_var = tk.StringVar(master, value="Ready")
+        self.status_bar = tk.Label(master, textvariable=self.text_var, bd=0, relief=tk.FLAT, anchor=tk.W)
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        self._file_path: Optional[str] = None
+        self._file_info = "Untitled"
+        self._time_second = -1
+        self._time_info = ""
 
-    def update_status_bar(self, file_path: Optional[str] = None, word_count: int = 0):
-        file_info = "Untitled" if file_path is None else file_path
-        time_info = time.strftime('%I:%M:%S %p')
-        self.status_bar.config(text=f"File: {file_info} - {time_info} - Words: {word_count}")
+    def set_text(self, text: str):
+        """
+        Show `text` in the status bar, skipping the update if it is already displayed.
+        """
+        if text != self.text_var.get():
+            self.text_var.set(text)
 
     def configure(self, **kwargs):
-        self.status_bar.config(**kwargs)
-        
+        if "text" in kwargs:
+            self.set_text(kwargs.pop("text"))
+        if kwargs:
+            self.status_bar.config(**kwargs)
+
     def update_status_bar(self, file_path: Optional[str] = None, word_count: int = 0):
-        print(f"Update status bar called at: {time.time()}")
-        file_info = "Untitled" if file_path is None else os.path.basename(file_path)
-        time_info = time.strftime('%I:%M:%S %p')
-        self.status_bar.config(text=f"File: {file_info} - {time_info} - Words: {word_count}")
+        # The displayed name only changes when a different file is opened or saved
+        if file_path != self._file_path:
+            self._file_path = file_path
+            self._file_info = "Untitled" if file_path is None else os.path.basename(file_path)
+        file_info = self._file_info
+        # Format the clock at most once per second
+        now = int(time.time())
+        if now != self._time_second:
+            self._time_second = now
+            self._time_info = time.strftime('%I:%M:%S %p', time.localtime(now))
+        time_info = self._time_info
+        self.set_text(f"File: {file_info} - {time_info} - Words: {word_count}")
 
     def create_status_bar(self):
         """
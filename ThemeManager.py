@@ -1,22 +1,65 @@
-import json
-from typing import Dict
-import tkinter as tk
+from typing import Any, Dict, Optional
 import logging
-
-# Setup logging
-logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+import os
+import sys
+from types import MappingProxyType
+
+from JsonIO import read_json, dumps as _dumps
+
+logger = logging.getLogger(__name__)
+
+# Keys every theme must define
+_REQUIRED_THEME_KEYS = frozenset(("background", "text"))
+
+# Used when the theme file has no dark theme or cannot be read; copied into the themes
+# so a manager can edit and save them without touching the constant
+_DEFAULT_DARK_THEME = MappingProxyType({
+    "background": "#1E1E1E",
+    "text": "#FFFFFF",
+    "highContrastForeground": "#FFFFFF"
+})
+
+def intern_themes(themes: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Return a copy of the themes with every name, key and string value interned.
+
+    Theme files repeat the same keys in every theme and the same colors many times, so
+    interning leaves one object per distinct string.
+
+    :param themes: Themes as parsed from JSON; left unchanged, as it may be a shared cached parse
+    :return: The interned copy, or `themes` itself if it is not a dictionary of themes
+    """
+    if not isinstance(themes, dict):
+        return themes  # Not a theme file; left for the caller to reject
+    intern = sys.intern
+    return {intern(name): {intern(key): intern(value) if isinstance(value, str) else value
+                           for key, value in theme.items()} if isinstance(theme, dict) else theme
+            for name, theme in themes.items()}
 
 class ThemeManager:
+    __slots__ = ("theme_file", "_themes", "current_theme", "default_theme_used")
+
     def __init__(self, theme_file: str = "themes.json"):
         """
         Initialize the ThemeManager with a path to the theme file.
 
+        The file is not read until the themes are first needed.
+
         :param theme_file: Path to the themes JSON file (default: "themes.json")
         """
         self.theme_file = theme_file
-        self.themes = self.load_themes()
+        self._themes: Optional[Dict[str, Dict[str, str]]] = None
         self.current_theme = "dark"  # Default theme is now dark
-        self.default_theme_used = False  # Flag to indicate if default theme was used
+        self.default_theme_used = False  # Flag to indicate if default theme was used; set by load_themes
+
+    @property
+    def themes(self) -> Dict[str, Dict[str, str]]:
+        """
+        The loaded themes, read from the theme file on first access.
+        """
+        if self._themes is None:
+            self._themes = self.load_themes()
+        return self._themes
 
     def load_themes(self) -> Dict[str, Dict[str, str]]:
         """
@@ -27,29 +70,18 @@ class ThemeManager:
         :return: Dictionary of themes where keys are theme names and values are dictionaries of color settings.
         """
         try:
-            with open(self.theme_file, 'r') as file:
-                themes = json.load(file)
-                
-                # Check if 'dark' theme exists in the loaded themes
-                if "dark" not in themes:
-                    logging.warning(f"'dark' theme not found in {self.theme_file}. Using default dark theme.")
-                    self.default_theme_used = True
-                    themes["dark"] = {
-                        "background": "#1E1E1E",
-                        "text": "#FFFFFF",
-                        "highContrastForeground": "#FFFFFF"
-                    }
-                return themes
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            logging.warning(f"Themes file not found or corrupted: {e}. Using default dark theme.")
+            themes = intern_themes(read_json(self.theme_file))
+
+            # Check if 'dark' theme exists in the loaded themes
+            if "dark" not in themes:
+                logger.warning(f"'dark' theme not found in {self.theme_file}. Using default dark theme.")
+                self.default_theme_used = True
+                themes["dark"] = dict(_DEFAULT_DARK_THEME)
+            return themes
+        except (FileNotFoundError, ValueError) as e:
+            logger.warning(f"Themes file not found or corrupted: {e}. Using default dark theme.")
             self.default_theme_used = True
-            return {
-                "dark": {
-                    "background": "#1E1E1E",
-                    "text": "#FFFFFF",
-                    "highContrastForeground": "#FFFFFF"
-                }
-            }
+            return {"dark": dict(_DEFAULT_DARK_THEME)}
 
     def get_themes(self) -> Dict[str, Dict[str, str]]:
         return self.themes
@@ -61,19 +93,37 @@ class ThemeManager:
         :param theme_name: Name of the theme to add or update
         :param theme_data: Dictionary with theme color settings
         """
-        required_keys = ["background", "text"]  # Example keys
-        if all(key in theme_data for key in required_keys):
+        if _REQUIRED_THEME_KEYS <= theme_data.keys():
             self.themes[theme_name] = theme_data
             self.save_themes()
             self.default_theme_used = False  # Reset flag when a theme is added
         else:
-            logging.error(f"Attempt to add an invalid theme '{theme_name}'. Missing required keys.")
+            logger.error(f"Attempt to add an invalid theme '{theme_name}'. Missing required keys.")
+
+    def add_themes(self, themes: Dict[str, Dict[str, str]]):
+        """
+        Add or update several themes at once, validating each and saving the file once.
+
+        Invalid themes are skipped and logged like in add_theme.
+
+        :param themes: Mapping of theme names to dictionaries with theme color settings
+        """
+        valid = {}
+        for theme_name, theme_data in themes.items():
+            if _REQUIRED_THEME_KEYS <= theme_data.keys():
+                valid[theme_name] = theme_data
+            else:
+                logger.error(f"Attempt to add an invalid theme '{theme_name}'. Missing required keys.")
+        if valid:
+            self.themes.update(valid)
+            self.save_themes()
+            self.default_theme_used = False  # Reset flag when a theme is added
 
     def apply_theme(self, theme_name: str) -> Dict[str, Dict[str, str]]:
         if theme_name in self.themes:
             self.current_theme = theme_name
             return self.themes[theme_name]
-        logging.warning(f"Requested theme '{theme_name}' not found. Using default dark theme.")
+        logger.warning(f"Requested theme '{theme_name}' not found. Using default dark theme.")
         return self.themes.get("dark", {})  # Fallback to dark theme if theme not found
 
     def remove_theme(self, theme_name: str):
@@ -89,12 +139,19 @@ class ThemeManager:
     def save_themes(self):
         """
         Save the current themes to the JSON file.
+
+        The file is written to a temporary path, synced once, and moved into place so an
+        interrupted write never leaves a truncated themes file behind.
         """
+        tmp_file = f"{self.theme_file}.tmp"
         try:
-            with open(self.theme_file, 'w') as file:
-                json.dump(self.themes, file, indent=4)
+            with open(tmp_file, 'wb') as file:
+                file.write(_dumps(self.themes))
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_file, self.theme_file)
         except IOError as e:
-            logging.error(f"Error saving themes: {e}")
+            logger.error(f"Error saving themes: {e}")
 
     def get_current_theme(self) -> Dict[str, Dict[str, str]]:
         """
@@ -110,4 +167,6 @@ class ThemeManager:
 
         :return: True if default theme was used, False otherwise.
         """
+        if self._themes is None:
+            self._themes = self.load_themes()  # Only loading the themes can tell
         return self.default_theme_used
\ No newline at end of file
@@ -0,0 +1,134 @@
+# UndoStack.py
+
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+# (offset, removed, inserted): replace `removed` at `offset` with `inserted`
+Delta = Tuple[int, str, str]
+
+def compute_delta(old: str, new: str) -> Delta:
+    """
+    Describe the single contiguous change that turns `old` into `new`.
+
+    The common prefix and suffix are found by comparing slices, which keeps the
+    character comparisons in C rather than in a Python loop.
+
+    :param old: The original text.
+    :param new: The changed text.
+    :return: A (offset, removed, inserted) delta.
+    """
+    limit = min(len(old), len(new))
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[:mid] == new[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    prefix = lo
+
+    lo, hi = 0, limit - prefix
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[len(old) - mid:] == new[len(new) - mid:]:
+            lo = mid
+        else:
+            hi = mid - 1
+    suffix = lo
+
+    return prefix, old[prefix:len(old) - suffix], new[prefix:len(new) - suffix]
+
+def compute_tk_delta(old: str, new: str) -> Delta:
+    """
+    Like `compute_delta`, for two dumps of a Tk text widget taken with get("1.0", "end").
+
+    Both dumps end with the newline Tk keeps after the last line, and a Tk insert or
+    delete never goes past it: text inserted at `end` lands before that newline. A delta
+    reaching it is clamped to end-1c by moving it back one character, which shifts the
+    newline before it into both `removed` and `inserted`.
+
+    >>> compute_delta("a\\n", "a\\nb\\n")
+    (2, '', 'b\\n')
+    >>> compute_tk_delta("a\\n", "a\\nb\\n")
+    (1, '', '\\nb')
+
+    :param old: The widget's original text, ending with its final newline.
+    :param new: The changed text, ending with its final newline.
+    :return: A (offset, removed, inserted) delta that stays at or before end-1c.
+    """
+    offset, removed, inserted = compute_delta(old, new)
+    if offset and offset + len(removed) == len(old):
+        offset -= 1
+        # old[offset] is a newline, and so are the last characters of the shifted
+        # `removed` and `inserted`; that last one is the final newline Tk leaves in place
+        removed = (old[offset] + removed)[:-1]
+        inserted = (old[offset] + inserted)[:-1]
+    return offset, removed, inserted
+
+def apply_delta(text: str, delta: Delta) -> str:
+    """
+    Apply a delta produced by `compute_delta` to a string.
+
+    :param text: The text the delta was computed from.
+    :param delta: The (offset, removed, inserted) delta.
+    :return: The changed text.
+    """
+    offset, removed, inserted = delta
+    return text[:offset] + inserted + text[offset + len(removed):]
+
+class UndoStack:
+    """
+    A bounded stack of text snapshots that keeps only the newest one in full.
+
+    Every older snapshot is stored as a delta against the one pushed after it, so
+    memory grows with the size of the edits rather than the size of the document.
+    """
+
+    def __init__(self, maxlen: int = 50):
+        """
+        :param maxlen: Maximum number of snapshots kept; the oldest are dropped first.
+        """
+        self.maxlen = maxlen
+        self._top: Optional[str] = None
+        # _deltas[i] turns snapshot i + 1 back into snapshot i; the deque evicts the oldest
+        # on its own once the top snapshot plus the deltas reach maxlen
+        self._deltas: Deque[Delta] = deque(maxlen=max(maxlen - 1, 0))
+
+    def append(self, state: str) -> None:
+        """
+        Push a new snapshot.
+
+        :param state: The full text to remember.
+        """
+        if self._top is not None:
+            self._deltas.append(compute_delta(state, self._top))
+        self._top = state
+
+    def pop(self) -> str:
+        """
+        Remove and return the newest snapshot.
+
+        :return: The full text of the snapshot.
+        :raises IndexError: If the stack is empty.
+        """
+        if self._top is None:
+            raise IndexError("pop from empty UndoStack")
+        state = self._top
+        self._top = apply_delta(state, self._deltas.pop()) if self._deltas else None
+        return state
+
+    def peek(self) -> Optional[str]:
+        """
+        Return the newest snapshot without removing it, or None if the stack is empty.
+        """
+        return self._top
+
+    def clear(self) -> None:
+        """
+        Drop every snapshot.
+        """
+        self._top = None
+        self._deltas.clear()
+
+    def __len__(self) -> int:
+        return 0 if self._top is None else len(self._deltas) + 1